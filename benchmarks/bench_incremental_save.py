@@ -0,0 +1,41 @@
+"""
+Measure the serialization cost of saving a late round of a long event, with
+every round serialized from scratch and with cached fragments for the rounds
+that did not change.
+
+Run from the project root: python -m benchmarks.bench_incremental_save
+"""
+import random
+
+from .utils import build_tournament, replace_rounds, timed
+
+
+def main():
+    tournament = build_tournament(500, 10)
+    tournament.number_of_rounds = 11
+    tournament.to_dict()
+
+    round_instance = tournament.create_round()
+    for match in round_instance.matches:
+        match.set_result(random.choice("012"))
+    round_instance.end_round()
+
+    def serialize():
+        tournament.to_dict()
+
+    # every round never serialized, or only the last one
+    every_round = range(len(tournament.rounds))
+    last_round = [len(tournament.rounds) - 1]
+    full_time = timed(
+        serialize, setup=lambda: replace_rounds(tournament, every_round)
+    )
+    incremental_time = timed(
+        serialize, setup=lambda: replace_rounds(tournament, last_round)
+    )
+    print("500 players, saving round 11")
+    print(f"full serialization:        {full_time * 1000:8.2f} ms")
+    print(f"cached untouched rounds:   {incremental_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Measure the memory used per player and per match by the model classes,
+compared with the dict-backed classes they were before using __slots__, on
+a synthetic 10,000-player, 11-round event.
+
+Run from the project root: python -m benchmarks.bench_model_memory
+"""
+import random
+import tracemalloc
+
+from models.match import Match
+from models.player import Player
+from models.round import Round
+
+
+class LegacyPlayer:
+    def __init__(
+            self, name, surname, birthday, national_chess_id, score=0.0,
+            rating=1500.0
+    ):
+        self.name = name
+        self.surname = surname
+        self.birthday = birthday
+        self.national_chess_id = national_chess_id
+        self.score = score
+        self.rating = rating
+
+
+class LegacyMatch:
+    def __init__(
+            self, player_1, player_2, player_1_match_score=0,
+            player_2_match_score=0
+    ):
+        self.player_1 = player_1
+        self.player_2 = player_2
+        self.player_1_match_score = player_1_match_score
+        self.player_2_match_score = player_2_match_score
+        self._serialized = None
+
+
+class LegacyRound:
+    def __init__(self, round_name, matches=None):
+        self.round_name = round_name
+        self.matches = matches if matches else []
+        self.start_date = None
+        self.end_date = None
+        self.bye = None
+        self.bye_score = 0
+        self._serialized = None
+
+
+def traced(function):
+    """
+    Measure the memory still allocated after calling a function.
+
+    :param function: The function to measure, called without arguments.
+    :return: A tuple (result, allocated bytes).
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def measure(player_class, match_class, round_class, players_data, schedule):
+    """
+    Build the event with the given classes.
+
+    :return: A tuple (bytes per player, bytes per match).
+    """
+    players, players_size = traced(
+        lambda: [player_class(*player_data) for player_data in players_data]
+    )
+
+    def build_rounds():
+        return [
+            round_class(f"Round {number}", [
+                match_class(players[first], players[second])
+                for first, second in pairs
+            ])
+            for number, pairs in enumerate(schedule, start=1)
+        ]
+
+    rounds, rounds_size = traced(build_rounds)
+    match_count = sum(len(round_instance.matches) for round_instance in rounds)
+    return players_size / len(players), rounds_size / match_count
+
+
+def main(number_of_players=10000, number_of_rounds=11):
+    random.seed(0)
+    # the field values are built beforehand, so only the model objects and
+    # their containers are measured
+    players_data = [
+        (f"Name{index}", f"Surname{index}", "2000-01-01", f"AB{index:05d}")
+        for index in range(number_of_players)
+    ]
+    schedule = []
+    for _ in range(number_of_rounds):
+        order = list(range(number_of_players))
+        random.shuffle(order)
+        schedule.append(list(zip(order[::2], order[1::2])))
+
+    results = {
+        "dict": measure(
+            LegacyPlayer, LegacyMatch, LegacyRound, players_data, schedule
+        ),
+        "slots": measure(Player, Match, Round, players_data, schedule),
+    }
+
+    print(f"{number_of_players} players, {number_of_rounds} rounds")
+    print(f"{'classes':<10}{'per player (B)':>16}{'per match (B)':>16}")
+    for label, (player_size, match_size) in results.items():
+        print(f"{label:<10}{player_size:>16.1f}{match_size:>16.1f}")
+    print(
+        f"player: -{100 * (1 - results['slots'][0] / results['dict'][0]):.1f}%"
+        f"  match: -"
+        f"{100 * (1 - results['slots'][1] / results['dict'][1]):.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the size and save time of a tournament document with embedded
+players in every match (legacy format) and with normalized player references.
+
+Run from the project root: python -m benchmarks.bench_normalized_documents
+"""
+import json
+import os
+import tempfile
+
+from models.database import Database
+
+from .utils import build_tournament, timed
+
+
+def legacy_serialize(tournament):
+    """
+    Serialize a tournament the way it was stored before normalization, with
+    the full player record embedded in every match.
+
+    :param tournament: The Tournament instance.
+    :return: A dictionary representation of the tournament.
+    """
+    tournament_data = tournament.to_dict()
+    # copy the round dictionaries, they are the cached serialized rounds
+    tournament_data["rounds"] = [
+        dict(round_data, matches=[
+            (
+                [{
+                    "player_1": match.player_1.serialize(),
+                    "player_1_match_score": match.player_1_match_score
+                }],
+                [{
+                    "player_2": match.player_2.serialize(),
+                    "player_2_match_score": match.player_2_match_score
+                }]
+            )
+            for match in round_instance.matches
+        ])
+        for round_data, round_instance in zip(
+            tournament_data["rounds"], tournament.rounds
+        )
+    ]
+    return tournament_data
+
+
+def main():
+    tournament = build_tournament(200, 9)
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {}
+        for label, serializer in (
+            ("legacy", legacy_serialize),
+            ("normalized", lambda t: t.to_dict()),
+        ):
+            database = Database(os.path.join(directory, label))
+            doc_id = database.insert_tournament(serializer(tournament))
+
+            def save():
+                database.update_tournament(doc_id, serializer(tournament))
+
+            save_time = timed(save)
+            results[label] = (
+                len(json.dumps(serializer(tournament))),
+                os.path.getsize(os.path.join(
+                    directory, label, "tournaments", f"{doc_id}.json"
+                )),
+                save_time
+            )
+            database.close()
+
+    print("200 players, 9 rounds")
+    print(f"{'format':<12}{'document (B)':>14}{'file (B)':>14}"
+          f"{'save (ms)':>12}")
+    for label, (document_size, file_size, save_time) in results.items():
+        print(f"{label:<12}{document_size:>14}{file_size:>14}"
+              f"{save_time * 1000:>12.2f}")
+
+    legacy_size = results["legacy"][1]
+    normalized_size = results["normalized"][1]
+    print(
+        f"size: -{100 * (1 - normalized_size / legacy_size):.1f}%  "
+        f"save time: -"
+        f"{100 * (1 - results['normalized'][2] / results['legacy'][2]):.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Time the pairing of every round of a large Swiss open and count rematches,
+for 500 players with every pairing system and for 1,000 players with the
+weighted one.
+
+Run from the project root: python -m benchmarks.bench_pairing
+"""
+import random
+import time
+
+from models.player import Player
+from models.tournament import Tournament
+
+
+def main(
+        number_of_players=500, number_of_rounds=9, pairing_system="weighted"
+):
+    random.seed(0)
+    players = [
+        Player(f"Name{index}", f"Surname{index}", "2000-01-01",
+               f"AB{index:05d}")
+        for index in range(number_of_players)
+    ]
+    tournament = Tournament(
+        "Benchmark Open", "Paris", "Synthetic tournament", players,
+        number_of_rounds, pairing_system=pairing_system
+    )
+
+    print(f"{number_of_players} players, {number_of_rounds} rounds, "
+          f"{pairing_system} pairing")
+    seen_pairs = set()
+    for _ in range(number_of_rounds):
+        start = time.perf_counter()
+        round_instance = tournament.create_round()
+        elapsed = time.perf_counter() - start
+
+        rematches = 0
+        for match in round_instance.matches:
+            pair = frozenset([
+                match.player_1.national_chess_id,
+                match.player_2.national_chess_id
+            ])
+            rematches += pair in seen_pairs
+            seen_pairs.add(pair)
+            match.set_result(random.choice("012"))
+
+        print(f"{round_instance.round_name:<10}{elapsed * 1000:10.1f} ms"
+              f"{len(round_instance.matches):8} matches"
+              f"{rematches:6} rematches")
+
+
+if __name__ == "__main__":
+    for name in ("weighted", "dutch", "parallel"):
+        main(pairing_system=name)
+    # the weighted system pairs the ranking in blocks, check it scales
+    main(1000, pairing_system="weighted")
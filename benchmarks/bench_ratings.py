@@ -0,0 +1,215 @@
+"""
+Measure the time to recompute the Elo ratings of 100,000 players from ten
+years of stored tournaments, end to end: reading the games of every
+tournament, ordering them by rating period, the vectorized replay and the
+update of the player registry. The first recompute reads the tournament
+files and fills the games cache, the next ones read the cached arrays. The
+replay is compared with a Python loop over dictionaries applying the same
+rating periods.
+
+The Python loop is timed on the first tenth of the games only and
+extrapolated, its ratings are checked against the vectorized replay of the
+same games.
+
+Run from the project root: python -m benchmarks.bench_ratings
+"""
+import tempfile
+import time
+
+import numpy as np
+
+from models.database import Database
+from models.player import Player
+from models.ratings import (
+    DEFAULT_RATING, K_FACTOR, collect_games, recompute_ratings, replay
+)
+
+# the match scores of a white win, a draw and a black win
+RESULTS = ((1.0, 0.0), (0.5, 0.5), (0.0, 1.0))
+
+
+def build_database(
+        directory, number_of_players, number_of_years, tournaments_per_month,
+        players_per_tournament=100, number_of_rounds=9, seed=0
+):
+    """
+    Build a database of synthetic finished tournaments, with results drawn
+    from a hidden strength of each player. Every tournament is played within
+    one month.
+
+    :return: The Database instance.
+    """
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(DEFAULT_RATING, 200, number_of_players)
+    players = [
+        Player(
+            f"Name{index}", f"Surname{index}", "2000-01-01",
+            f"AB{index:06d}"
+        )
+        for index in range(number_of_players)
+    ]
+    ids = [player.national_chess_id for player in players]
+    entries = [player.to_dict() for player in players]
+
+    database = Database(directory)
+    database.players_index.insert_multiple(
+        [player.serialize() for player in players]
+    )
+    tournaments = []
+    for month_index in range(12 * number_of_years):
+        month = f"{2015 + month_index // 12}-{month_index % 12 + 1:02d}"
+        for index in range(tournaments_per_month):
+            rows = rng.choice(
+                number_of_players, players_per_tournament, replace=False
+            )
+            rounds = []
+            for round_number in range(number_of_rounds):
+                order = rng.permutation(rows)
+                rows_1, rows_2 = order[0::2], order[1::2]
+                expected = 1.0 / (
+                    1.0 + 10.0 ** ((strength[rows_2] - strength[rows_1]) / 400)
+                )
+                draws = rng.random(len(rows_1)) < 0.3
+                wins = rng.random(len(rows_1)) < expected
+                outcomes = np.where(draws, 1, np.where(wins, 0, 2)).tolist()
+                day = 1 + index % 19 + round_number
+                rounds.append({
+                    "round_name": f"Round {round_number + 1}",
+                    "matches": [
+                        [ids[row_1], RESULTS[outcome][0],
+                         ids[row_2], RESULTS[outcome][1]]
+                        for row_1, row_2, outcome in zip(
+                            rows_1.tolist(), rows_2.tolist(), outcomes
+                        )
+                    ],
+                    "start_date": f"{month}-{day:02d}T14:00:00",
+                    "end_date": f"{month}-{day:02d}T18:00:00",
+                    "bye": None
+                })
+            tournaments.append({
+                "name": f"Open {month} #{index}",
+                "location": "Paris",
+                "description": "Synthetic tournament",
+                "players": [entries[row] for row in rows.tolist()],
+                "number_of_rounds": number_of_rounds,
+                "current_round_number": number_of_rounds,
+                "rounds": rounds,
+                "start_date": rounds[0]["start_date"],
+                "end_date": rounds[-1]["end_date"]
+            })
+
+    with database.unit_of_work():
+        for doc_id, tournament_data in enumerate(tournaments, 1):
+            database.tournament_store.write(doc_id, tournament_data)
+        database.tournament_summaries.rebuild(
+            enumerate(tournaments, 1)
+        )
+    return database
+
+
+def python_replay(periods, rows_1, rows_2, scores_1, scores_2):
+    """
+    Replay the rating periods with a Python loop over dictionaries.
+
+    :return: A dictionary of ratings keyed by row.
+    """
+    ratings = {}
+    changes = {}
+    current_period = None
+    for period, row_1, row_2, score_1, score_2 in zip(
+        periods.tolist(), rows_1.tolist(), rows_2.tolist(),
+        scores_1.tolist(), scores_2.tolist()
+    ):
+        if period != current_period:
+            for row, change in changes.items():
+                ratings[row] = ratings.get(row, DEFAULT_RATING) + change
+            changes = {}
+            current_period = period
+        rating_1 = ratings.get(row_1, DEFAULT_RATING)
+        rating_2 = ratings.get(row_2, DEFAULT_RATING)
+        expected_1 = 1.0 / (1.0 + 10.0 ** ((rating_2 - rating_1) / 400.0))
+        changes[row_1] = (
+            changes.get(row_1, 0.0) + K_FACTOR * (score_1 - expected_1)
+        )
+        changes[row_2] = (
+            changes.get(row_2, 0.0)
+            + K_FACTOR * (score_2 - (1.0 - expected_1))
+        )
+    for row, change in changes.items():
+        ratings[row] = ratings.get(row, DEFAULT_RATING) + change
+    return ratings
+
+
+def main(number_of_players=100000, number_of_years=10,
+         tournaments_per_month=178):
+    with tempfile.TemporaryDirectory() as directory:
+        run(
+            directory, number_of_players, number_of_years,
+            tournaments_per_month
+        )
+
+
+def run(directory, number_of_players, number_of_years, tournaments_per_month):
+    start = time.perf_counter()
+    database = build_database(
+        directory, number_of_players, number_of_years, tournaments_per_month
+    )
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    recompute_ratings(database)
+    first_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rows, *games = collect_games(
+        games for _, games in database.all_tournament_games()
+    )
+    collect_time = time.perf_counter() - start
+    game_count = len(games[0])
+
+    start = time.perf_counter()
+    replay(len(rows), *games)
+    replay_time = time.perf_counter() - start
+
+    period_count = int(games[0][-1]) + 1
+    # a prefix of whole rating periods
+    sample = int(np.searchsorted(games[0], games[0][game_count // 10]))
+    start = time.perf_counter()
+    python_ratings = python_replay(*(column[:sample] for column in games))
+    python_time = (time.perf_counter() - start) * game_count / sample
+
+    sample_ratings = replay(len(rows), *(column[:sample] for column in games))
+    assert all(
+        abs(sample_ratings[row] - rating) < 1e-6
+        for row, rating in python_ratings.items()
+    )
+    del rows, games
+
+    start = time.perf_counter()
+    recompute_ratings(database)
+    total_time = time.perf_counter() - start
+    ratings = np.array([
+        player_data["rating"] for player_data in database.players_index.all()
+    ])
+
+    print(
+        f"{number_of_players} players, "
+        f"{len(database.tournament_summaries.doc_ids())} tournaments, "
+        f"{game_count} games in {period_count} rating periods "
+        f"(built in {build_time:.1f} s)"
+    )
+    print(f"python loop (extrapolated): {python_time:8.2f} s")
+    print(f"first recompute_ratings:    {first_time:8.2f} s")
+    print(f"read cache + collect_games: {collect_time:8.2f} s")
+    print(f"vectorized replay:          {replay_time:8.2f} s")
+    print(f"recompute_ratings:          {total_time:8.2f} s")
+    print(
+        f"ratings: min {ratings.min():.0f}  max {ratings.max():.0f}  "
+        f"replay speedup: x{python_time / replay_time:.0f}  "
+        f"replay share of the recompute: {replay_time / total_time:.0%}"
+    )
+    database.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Measure the load and save throughput, in matches per second, of a full
+tournament document round trip (JSON text to model objects and back) with
+the previous nested match format and constructor-based conversion, and with
+the flat match format and the from_dict/to_dict methods of the models.
+
+Run from the project root: python -m benchmarks.bench_round_trip
+"""
+import json
+from datetime import datetime
+
+from models.match import Match
+from models.player import Player
+from models.player_identity_map import PlayerIdentityMap
+from models.round import Round
+from models.tournament import Tournament
+
+from .utils import build_tournament, replace_rounds, timed
+
+
+def legacy_match_to_dict(match):
+    """
+    Serialize a match to the nested format used before the flat format.
+
+    :param match: The Match instance.
+    :return: A tuple representation of the match.
+    """
+    return (
+        [{
+            "player_1": match.player_1.national_chess_id,
+            "player_1_match_score": match.player_1_match_score
+        }],
+        [{
+            "player_2": match.player_2.national_chess_id,
+            "player_2_match_score": match.player_2_match_score
+        }]
+    )
+
+
+def legacy_to_dict(tournament):
+    """
+    Serialize a tournament with its matches in the nested format.
+
+    :param tournament: The Tournament instance.
+    :return: A dictionary representation of the tournament.
+    """
+    return {
+        "name": tournament.name,
+        "location": tournament.location,
+        "description": tournament.description,
+        "players": [player.to_dict() for player in tournament.players],
+        "number_of_rounds": tournament.number_of_rounds,
+        "current_round_number": tournament.current_round_number,
+        "rounds": [
+            {
+                "round_name": round_instance.round_name,
+                "matches": [
+                    legacy_match_to_dict(match)
+                    for match in round_instance.matches
+                ],
+                "start_date": round_instance.start_date.isoformat(),
+                "end_date": round_instance.end_date.isoformat(),
+                # the benchmark fields are even, no round has a bye
+                "bye": None
+            }
+            for round_instance in tournament.rounds
+        ]
+    }
+
+
+def legacy_from_dict(tournament_data):
+    """
+    Convert a tournament with nested matches the way the controller did,
+    with keyword unpacking and the model constructors.
+
+    :param tournament_data: The serialized tournament.
+    :return: The Tournament instance with every round converted.
+    """
+    identity_map = PlayerIdentityMap()
+    players = [
+        identity_map.add(Player(**player_data))
+        for player_data in tournament_data["players"]
+    ]
+    rounds = []
+    for round_data in tournament_data["rounds"]:
+        matches = []
+        for match_data in round_data["matches"]:
+            match = Match(
+                identity_map.get(match_data[0][0]["player_1"]),
+                identity_map.get(match_data[1][0]["player_2"]),
+                match_data[0][0]["player_1_match_score"],
+                match_data[1][0]["player_2_match_score"]
+            )
+            matches.append(match)
+        bye_data = round_data.get("bye")
+        round_instance = Round(
+            round_name=round_data["round_name"],
+            matches=matches,
+            start_date=(
+                datetime.fromisoformat(round_data["start_date"])
+                if round_data.get("start_date")
+                else None
+            ),
+            end_date=(
+                datetime.fromisoformat(round_data["end_date"])
+                if round_data.get("end_date")
+                else None
+            ),
+            bye=identity_map.get(bye_data["player"]) if bye_data else None,
+            bye_score=bye_data["score"] if bye_data else 0
+        )
+        rounds.append(round_instance)
+    return Tournament(
+        name=tournament_data["name"],
+        location=tournament_data["location"],
+        description=tournament_data["description"],
+        players=players,
+        number_of_rounds=tournament_data["number_of_rounds"],
+        current_round_number=tournament_data["current_round_number"],
+        rounds=rounds,
+        identity_map=identity_map
+    )
+
+
+def flat_from_dict(tournament_data):
+    """
+    Convert a tournament with flat matches, converting every round.
+
+    :param tournament_data: The serialized tournament.
+    :return: The Tournament instance.
+    """
+    tournament = Tournament.from_dict(tournament_data)
+    list(tournament.rounds)
+    return tournament
+
+
+def main(number_of_players=1000, number_of_rounds=11):
+    tournament = build_tournament(number_of_players, number_of_rounds)
+    match_count = sum(
+        len(round_instance.matches) for round_instance in tournament.rounds
+    )
+
+    results = {}
+    for label, to_dict, from_dict in (
+        ("nested", legacy_to_dict, legacy_from_dict),
+        ("flat", lambda t: t.to_dict(), flat_from_dict),
+    ):
+        def save():
+            json.dumps(to_dict(tournament))
+
+        def unsaved():
+            replace_rounds(tournament, range(len(tournament.rounds)))
+
+        text = json.dumps(to_dict(tournament))
+
+        def load():
+            from_dict(json.loads(text))
+
+        results[label] = (
+            match_count / timed(load),
+            match_count / timed(save, setup=unsaved), len(text)
+        )
+
+    print(
+        f"{number_of_players} players, {number_of_rounds} rounds, "
+        f"{match_count} matches"
+    )
+    print(
+        f"{'format':<10}{'load (matches/s)':>20}{'save (matches/s)':>20}"
+        f"{'size (B)':>12}"
+    )
+    for label, (load_rate, save_rate, size) in results.items():
+        print(f"{label:<10}{load_rate:>20,.0f}{save_rate:>20,.0f}{size:>12,}")
+    print(
+        f"load: x{results['flat'][0] / results['nested'][0]:.2f}"
+        f"  save: x{results['flat'][1] / results['nested'][1]:.2f}"
+        f"  size: -{100 * (1 - results['flat'][2] / results['nested'][2]):.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
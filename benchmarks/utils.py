@@ -0,0 +1,97 @@
+import random
+import time
+
+from models.lazy_rounds import LazyRounds
+from models.match import Match
+from models.player import Player
+from models.round import Round
+from models.tournament import Tournament
+
+
+def build_tournament(number_of_players, number_of_rounds, seed=0):
+    """
+    Build a synthetic tournament with every round played.
+
+    :param number_of_players: The number of players in the tournament.
+    :param number_of_rounds: The number of rounds to play.
+    :param seed: The seed of the random results.
+    :return: The Tournament instance.
+    """
+    random.seed(seed)
+    players = [
+        Player(
+            f"Name{index}", f"Surname{index}", "2000-01-01",
+            f"AB{index:05d}"
+        )
+        for index in range(number_of_players)
+    ]
+    tournament = Tournament(
+        "Benchmark Open", "Paris", "Synthetic tournament", players,
+        number_of_rounds
+    )
+    tournament.set_start_date()
+    for _ in range(number_of_rounds):
+        round_instance = tournament.create_round()
+        tournament.start_current_round()
+        for match in round_instance.matches:
+            match.set_result(random.choice("012"))
+        round_instance.end_round()
+    return tournament
+
+
+def unsaved_copy(round_instance):
+    """
+    Copy a round and its matches with the model constructors. The copies
+    have never been serialized, like a round whose results were just
+    entered.
+
+    :param round_instance: The Round instance.
+    :return: The new Round instance.
+    """
+    return Round(
+        round_instance.round_name,
+        [
+            Match(
+                match.player_1, match.player_2, match.player_1_match_score,
+                match.player_2_match_score
+            )
+            for match in round_instance.matches
+        ],
+        round_instance.start_date, round_instance.end_date,
+        round_instance.bye, round_instance.bye_score
+    )
+
+
+def replace_rounds(tournament, unsaved):
+    """
+    Replace the rounds of a tournament, the ones at the given positions by
+    copies that have never been serialized.
+
+    :param tournament: The Tournament instance.
+    :param unsaved: The positions of the rounds to copy.
+    """
+    tournament.rounds = LazyRounds([
+        unsaved_copy(round_instance) if position in unsaved
+        else round_instance
+        for position, round_instance in enumerate(tournament.rounds)
+    ])
+
+
+def timed(function, repeat=5, setup=None):
+    """
+    Time a function, keeping the best of several runs.
+
+    :param function: The function to time, called without arguments.
+    :param repeat: The number of runs.
+    :param setup: A function called without arguments before each run,
+        not timed.
+    :return: The best run time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
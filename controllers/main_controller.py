@@ -1,21 +1,28 @@
+from models.database import Database
+from models.export import (
+    MATCH_FIELDS, export_records, iter_match_records, iter_player_records
+)
 from models.player import Player
-from models.match import Match
-from models.round import Round
+from models.player_import import (
+    PLAYER_FIELDS, import_players, read_player_rows
+)
+from models.pairing import PAIRING_SYSTEM_NAMES
+from models.pairing_precomputer import PairingPrecomputer
+from models.ratings import recompute_ratings, update_round_ratings
 from models.tournament import Tournament
 from views.view import View
 
-from datetime import datetime
-
-from tinydb import TinyDB, Query
-
-db = TinyDB("data/db.json")
-
 
 class Controller:
-    def __init__(self):
+    def __init__(self, database=None):
         """
-        Initialize the Controller with a View instance.
+        Initialize the Controller with a View instance and a Database.
+
+        :param database: The Database instance to use, defaults to the
+            database in the "data" directory (players.json, catalog.json
+            and tournaments/), opened on first use.
         """
+        self.database = database if database else Database()
         self.view = View()
         self.tournament = None
 
@@ -57,6 +64,10 @@ class Controller:
                 self.db_add_players()
             elif choice == "3":
                 self.db_edit_player()
+            elif choice == "4":
+                self.db_import_players()
+            elif choice == "5":
+                self.db_recompute_ratings()
             elif choice == "0":
                 return
             else:
@@ -101,6 +112,10 @@ class Controller:
                 self.report_tournament_players()
             elif choice == "5":
                 self.report_tournament_rounds_and_matches()
+            elif choice == "6":
+                self.export(iter_player_records(self.database), PLAYER_FIELDS)
+            elif choice == "7":
+                self.export(iter_match_records(self.database), MATCH_FIELDS)
             elif choice == "0":
                 return
             else:
@@ -156,25 +171,45 @@ class Controller:
         if tournament and tournament.rounds:
             self.view.show_all_rounds(tournament, tournament.rounds)
 
+    def export(self, records, fieldnames):
+        """
+        Stream records to a file chosen by the user.
+
+        :param records: An iterable of records.
+        :param fieldnames: The columns used for CSV files.
+        """
+        path = self.view.prompt_for_export_file()
+        if not path:
+            return
+
+        try:
+            count = export_records(records, path, fieldnames)
+        except (OSError, ValueError) as error:
+            self.view.print(f"\nExport failed: {error}\n")
+            return
+
+        self.view.print(f"\n{count} records exported to {path}.\n")
+
     def db_show_all_players(self):
         """
         Display all players sorted alphabetically.
         """
-        self.db_sort_players_alphabetically()
-
-        players_table = db.table("players")
-        players_data = players_table.all()
+        players_data = self.database.players_index.sorted_all()
 
         if not players_data:
             self.view.print("No players available.")
             return
 
-        players = [Player(**player) for player in players_data]
+        players = [Player.from_dict(player) for player in players_data]
         self.view.show_all_players(players)
 
     def db_add_players(self):
         """
         Add new players to the database in the "players" table.
+
+        Each player is written in its own unit of work as soon as it is
+        entered, so interrupting the session keeps the players already
+        entered.
         """
         while True:
             (name, surname, birthday, national_chess_id) = (
@@ -189,13 +224,58 @@ class Controller:
                 return
 
             player = Player(name, surname, birthday, national_chess_id)
-            player.db_save_player()
-
-            self.db_sort_players_alphabetically()
+            with self.database.unit_of_work():
+                player.db_save_player(self.database)
 
             if not self.view.prompt_for_add_another_player():
                 return
 
+    def db_import_players(self):
+        """
+        Import players from a CSV, NDJSON or JSON licensee file in the
+        "players" table, skipping invalid rows and already registered
+        national chess IDs.
+        """
+        path = self.view.prompt_for_import_file()
+        if not path:
+            return
+
+        try:
+            report = import_players(
+                self.database,
+                read_player_rows(path),
+                progress=self.view.show_import_progress
+            )
+        except (OSError, ValueError) as error:
+            self.view.print(f"\nImport failed: {error}\n")
+            return
+
+        self.view.show_import_report(report)
+
+    def db_recompute_ratings(self):
+        """
+        Recompute the Elo rating of every player in the "players" table from
+        the games of every stored tournament.
+        """
+        with self.database.unit_of_work():
+            game_count, player_count = recompute_ratings(self.database)
+        self.view.print(
+            f"\nRatings recomputed from {game_count} games "
+            f"of {player_count} players.\n"
+        )
+
+    def db_update_ratings(self, round_instance):
+        """
+        Update the Elo rating of the players of a finished round, in memory
+        and in the "players" table.
+
+        :param round_instance: The finished round instance.
+        """
+        players = update_round_ratings(round_instance)
+        self.database.players_index.update_ratings({
+            player.national_chess_id: player.rating for player in players
+        })
+
     def db_edit_player(self):
         """
         Edit an existing player's information in the database in the
@@ -208,17 +288,14 @@ class Controller:
         )
         national_chess_id = self.view.prompt_for_chess_id()
 
-        players_table = db.table("players")
-        player_data = players_table.get(
-            Query().national_chess_id == national_chess_id
-        )
+        player_data = self.database.players_index.get(national_chess_id)
 
         if not player_data:
             self.view.print("\nPlayer not found.\n")
             return
 
         # Convert the player data to a Player instance
-        player = Player(**player_data)
+        player = Player.from_dict(player_data)
 
         self.view.show_player(player)
         new_name, new_surname, new_birthday, new_national_chess_id = (
@@ -234,9 +311,19 @@ class Controller:
             else player.national_chess_id
         )
 
-        # Update the player in the database using serialize()
-        players_table.update(
-            player.serialize(), Query().national_chess_id == national_chess_id
+        if (
+            player.national_chess_id != national_chess_id
+            and player.national_chess_id in self.database.players_index
+        ):
+            self.view.print(
+                f"\nPlayer with National Chess ID {player.national_chess_id} "
+                "already exists.\n"
+            )
+            return
+
+        # Update the player in the database and in the index
+        self.database.players_index.update(
+            national_chess_id, player.serialize()
         )
 
         self.view.print("\nPlayer successfully updated.\n")
@@ -263,77 +350,80 @@ class Controller:
 
         return tournament
 
-    def db_sort_players_alphabetically(self):
-        """
-        Sort players alphabetically by name and surname in the "players" table
-        in the database.
-        """
-        players_table = db.table("players")
-
-        players = players_table.all()
-        if not players:
-            return
-
-        sorted_players = sorted(
-            players, key=lambda x: (
-                x["name"].lower(), x["surname"].lower()
-            )
-        )
-
-        players_table.truncate()
-
-        for player in sorted_players:
-            players_table.insert(player)
-
     def db_show_all_tournaments(self):
         """
-        Display all tournaments from the "tournaments" table in the database.
+        Display all tournaments from the "tournament_summaries" table in the
+        database.
         """
-        tournaments_table = db.table("tournaments")
-        tournaments_data = tournaments_table.all()
+        summaries = self.database.tournament_summaries.all()
 
-        if not tournaments_data:
+        if not summaries:
             self.view.print("No tournaments available.")
             return
 
-        tournaments = [
-            (Tournament(**tournament), tournament.doc_id)
-            for tournament in tournaments_data
-        ]
-        self.view.show_all_tournaments(tournaments)
+        self.view.show_all_tournaments(summaries)
 
     def create_tournament(self):
         """
         Create a new tournament and save it to the database.
         """
-        name, location, description, number_of_rounds = self.get_tournament_info()
+        (
+            name, location, description, number_of_rounds, pairing_system,
+            bye_score
+        ) = self.get_tournament_info()
         selected_players = self.select_tournament_players()
 
         self.tournament = Tournament(
-            name, location, description, selected_players, number_of_rounds
+            name, location, description, selected_players, number_of_rounds,
+            pairing_system=pairing_system, bye_score=bye_score
         )
 
         self.tournament = self.sort_tournament_players(self.tournament)
+        is_round_robin = self.tournament.is_round_robin()
+        number_of_rounds = self.tournament.number_of_rounds
         self.save_tournament_to_db()
         self.view.print("\nTournament saved.\n")
+        if is_round_robin:
+            self.view.print(
+                f"Round-robin schedule: {number_of_rounds} rounds.\n"
+            )
 
     def get_tournament_info(self):
         """
         Prompt the user for tournament information.
 
-        :return: Tuple containing tournament name, location, description, and
-                 number of rounds.
+        :return: Tuple containing tournament name, location, description,
+                 number of rounds, pairing system and bye score.
         """
-        name, location, description, number_of_rounds = (
-            self.view.prompt_for_tournament()
-        )
+        (
+            name, location, description, number_of_rounds, pairing_system,
+            bye_score
+        ) = self.view.prompt_for_tournament(PAIRING_SYSTEM_NAMES)
 
         if not number_of_rounds:
             number_of_rounds = 4
         else:
             number_of_rounds = int(number_of_rounds)
 
-        return name, location, description, number_of_rounds
+        pairing_system = pairing_system.strip().lower()
+        if not pairing_system:
+            pairing_system = "weighted"
+        elif pairing_system not in PAIRING_SYSTEM_NAMES:
+            self.view.print(
+                f"\nUnknown pairing system '{pairing_system}', "
+                "using the weighted pairing.\n"
+            )
+            pairing_system = "weighted"
+
+        if not bye_score:
+            bye_score = 1
+        else:
+            bye_score = float(bye_score)
+
+        return (
+            name, location, description, number_of_rounds, pairing_system,
+            bye_score
+        )
 
     def select_tournament_players(self):
         """
@@ -341,10 +431,9 @@ class Controller:
 
         :return: List of selected Player instances.
         """
-        players_table = db.table("players")
-        players_data = players_table.all()
+        players_data = self.database.players_index.sorted_all()
 
-        players = [Player(**player) for player in players_data]
+        players = [Player.from_dict(player) for player in players_data]
         self.view.show_all_players(players)
 
         national_chess_ids = self.view.prompt_for_add_tournament_players()
@@ -354,17 +443,9 @@ class Controller:
 
         selected_players = []
         for chess_id in national_chess_ids_list:
-            player_data = players_table.get(
-                Query().national_chess_id == chess_id
-            )
+            player_data = self.database.players_index.get(chess_id)
             if player_data:
-                player = Player(
-                    name=player_data["name"],
-                    surname=player_data["surname"],
-                    birthday=player_data["birthday"],
-                    national_chess_id=player_data["national_chess_id"]
-                )
-                selected_players.append(player)
+                selected_players.append(Player.from_dict(player_data))
             else:
                 self.view.print(
                     f"\nPlayer with National Chess ID {chess_id} not found.\n"
@@ -376,8 +457,7 @@ class Controller:
         """
         Save the current tournament to the database.
         """
-        tournaments_table = db.table("tournaments")
-        tournaments_table.insert(self.tournament.serialize())
+        self.tournament.save_tournament(self.database)
         self.tournament = None
 
     def add_tournament_players(self, tournament, tournament_id):
@@ -389,6 +469,13 @@ class Controller:
         added.
         :param tournament_id: The ID of the tournament in the database.
         """
+        if not tournament.accepts_new_players():
+            self.view.print(
+                "\nPlayers cannot be added to a round-robin tournament once "
+                "its first round is created.\n"
+            )
+            return
+
         self.view.show_all_tournament_players(tournament.players)
         players_data = self.get_all_players_data()
         self.view.show_all_players(players_data)
@@ -409,8 +496,10 @@ class Controller:
 
         :return: A list of player data dictionaries.
         """
-        players_table = db.table("players")
-        return [Player(**player) for player in players_table.all()]
+        return [
+            Player.from_dict(player)
+            for player in self.database.players_index.sorted_all()
+        ]
 
     def prompt_for_player_ids(self):
         """
@@ -458,11 +547,10 @@ class Controller:
         :param tournament_id: The ID of the tournament in the database.
         :param selected_players: List of Player instances to add.
         """
-        tournament.players.extend(selected_players)
+        tournament.add_players(selected_players)
         tournament = self.sort_tournament_players(tournament)
 
-        tournaments_table = db.table("tournaments")
-        tournaments_table.update(tournament.serialize(), doc_ids=[tournament_id])
+        self.db_update_tournament(tournament, tournament_id)
 
         self.view.print("\nTournament successfully updated.")
 
@@ -506,10 +594,7 @@ class Controller:
                 f"{player.name} {player.surname}."
             )
 
-        tournaments_table = db.table("tournaments")
-        tournaments_table.update(
-            tournament.serialize(), doc_ids=[tournament_id]
-        )
+        self.db_update_tournament(tournament, tournament_id)
 
         self.view.print("Tournament successfully updated.")
 
@@ -533,135 +618,57 @@ class Controller:
         tournament.description = (
             new_description if new_description else tournament.description
         )
-        tournament.number_of_rounds = (
-            int(new_number_of_rounds) if new_number_of_rounds
-            else tournament.number_of_rounds
-        )
+        if new_number_of_rounds and tournament.is_round_robin():
+            self.view.print(
+                "\nThe number of rounds of a round-robin tournament is set "
+                "by its schedule.\n"
+            )
+        elif new_number_of_rounds:
+            tournament.number_of_rounds = int(new_number_of_rounds)
 
-        tournaments_table = db.table("tournaments")
-        tournaments_table.update(
-            tournament.serialize(), doc_ids=[tournament_id]
-        )
+        self.db_update_tournament(tournament, tournament_id)
 
         self.view.print("\nTournament successfully updated.\n")
 
+    def db_update_tournament(self, tournament, tournament_id):
+        """
+        Update a tournament and its summary in the database.
+
+        :param tournament: The tournament instance.
+        :param tournament_id: The ID of the tournament in the database.
+        """
+        self.database.update_tournament(tournament_id, tournament.to_dict())
+
     def select_tournament(self):
         """
         Select a tournament from the database.
 
         :return: The selected tournament instance and its ID.
         """
-        tournaments_table = db.table("tournaments")
-        tournaments_data = tournaments_table.all()
+        summaries = self.database.tournament_summaries.all()
 
-        if not tournaments_data:
+        if not summaries:
             self.view.print("No tournaments available.")
             return None, None
 
-        tournaments = [
-            (Tournament(**tournament), tournament.doc_id)
-            for tournament in tournaments_data
-        ]
-        self.view.show_all_tournaments(tournaments)
+        self.view.show_all_tournaments(summaries)
 
         self.view.print("Enter the ID of the tournament you want to select :")
         tournament_id = int(self.view.prompt_for_tournament_id())
 
-        tournament_data = tournaments_table.get(doc_id=tournament_id)
+        tournament_data = self.database.get_tournament(tournament_id)
 
         if not tournament_data:
             self.view.print("\nTournament not found.\n")
             return None, None
 
-        players = self.convert_players(tournament_data["players"])
-        rounds = self.convert_rounds(tournament_data["rounds"])
-
-        tournament = Tournament(
-            name=tournament_data["name"],
-            location=tournament_data["location"],
-            description=tournament_data["description"],
-            players=players,
-            number_of_rounds=tournament_data["number_of_rounds"],
-            current_round_number=tournament_data["current_round_number"],
-            rounds=rounds,
-            start_date=(
-                datetime.fromisoformat(tournament_data["start_date"])
-                if tournament_data.get("start_date")
-                else None
-            ),
-            end_date=(
-                datetime.fromisoformat(tournament_data["end_date"])
-                if tournament_data.get("end_date")
-                else None
-            ),
-            doc_id=tournament_id
+        tournament = Tournament.from_dict(
+            tournament_data,
+            doc_id=tournament_id,
+            lookup=self.database.players_index.get
         )
         return tournament, tournament_id
 
-    def convert_players(self, players_data):
-        """
-        Convert player data to Player instances.
-
-        :param players_data: List of player data dictionaries.
-        :return: List of Player instances.
-        """
-        return [Player(**player_data) for player_data in players_data]
-
-    def convert_rounds(self, rounds_data):
-        """
-        Convert round data to Round instances.
-
-        :param rounds_data: List of round data dictionaries.
-        :return: List of Round instances.
-        """
-        rounds = []
-        for round_data in rounds_data:
-            matches = self.convert_matches(round_data["matches"])
-            start_date = (
-                datetime.fromisoformat(round_data["start_date"])
-                if round_data.get("start_date")
-                else None
-            )
-            end_date = (
-                datetime.fromisoformat(round_data["end_date"])
-                if round_data.get("end_date")
-                else None
-            )
-            round_instance = Round(
-                round_name=round_data["round_name"],
-                matches=matches,
-                start_date=start_date,
-                end_date=end_date
-            )
-            rounds.append(round_instance)
-        return rounds
-
-    def convert_matches(self, matches_data):
-        """
-        Convert match data to Match instances.
-
-        :param matches_data: List of match data dictionaries.
-        :return: List of Match instances.
-        """
-        matches = []
-        for match_data in matches_data:
-            player_1_data = match_data[0][0]["player_1"]
-            player_1_match_score = match_data[0][0]["player_1_match_score"]
-            player_2_data = match_data[1][0]["player_2"]
-            player_2_match_score = match_data[1][0]["player_2_match_score"]
-
-            player_1 = Player(**player_1_data)
-            player_2 = Player(**player_2_data)
-
-            match = Match(
-                player_1,
-                player_2,
-                player_1_match_score,
-                player_2_match_score
-            )
-            matches.append(match)
-        return matches
-
     def start_tournament(self):
         """
         Start a selected tournament instance.
@@ -684,27 +691,37 @@ class Controller:
             self.handle_tournament_end(tournament)
             return
 
+        precomputer = None
         while True:
-            round_instance = self.create_new_round(tournament)
+            round_instance = self.create_new_round(tournament, precomputer)
             if not round_instance:
                 return
 
             if not self.start_round(tournament, round_instance):
                 return
 
-            self.enter_match_results(round_instance)
+            precomputer = None
+            if (
+                tournament.current_round_number < tournament.number_of_rounds
+                and PairingPrecomputer.supports(tournament)
+            ):
+                precomputer = PairingPrecomputer(tournament)
+                precomputer.start()
+
+            self.enter_match_results(round_instance, precomputer)
 
             round_instance.end_round()
+            self.db_update_ratings(round_instance)
             self.view.show_round_results(round_instance)
 
-            ranked_players = tournament.get_ranked_players()
+            ranked_players, tie_breaks = tournament.get_standings()
 
             if tournament.current_round_number == tournament.number_of_rounds:
-                self.finalize_tournament(tournament, ranked_players)
+                self.finalize_tournament(tournament, ranked_players, tie_breaks)
                 return
 
-            self.view.show_ranked_players(ranked_players)
-            tournament.save_tournament()
+            self.view.show_ranked_players(ranked_players, tie_breaks)
+            tournament.save_tournament(self.database)
 
     def handle_tournament_end(self, tournament):
         """
@@ -713,14 +730,18 @@ class Controller:
         :param tournament: The tournament instance.
         """
         self.view.print("Tournament already ended.")
-        ranked_players = tournament.get_ranked_players()
-        self.view.show_tournament_results(tournament, ranked_players)
+        ranked_players, tie_breaks = tournament.get_standings()
+        self.view.show_tournament_results(
+            tournament, ranked_players, tie_breaks
+        )
 
-    def create_new_round(self, tournament):
+    def create_new_round(self, tournament, precomputer=None):
         """
         Prompt the user to create a new round.
 
         :param tournament: The tournament instance.
+        :param precomputer: The PairingPrecomputer pairing this round in the
+            background, if any.
         :return: The created round instance or None if cancelled.
         """
         round_number = int(tournament.current_round_number) + 1
@@ -728,8 +749,11 @@ class Controller:
         while True:
             choice = self.view.prompt_for_create_round(round_number)
             if choice == "y":
-                return tournament.create_round()
+                precomputed = precomputer.take() if precomputer else None
+                return tournament.create_round(precomputed)
             elif choice == "n":
+                if precomputer:
+                    precomputer.stop()
                 self.view.print(
                     "Round creation cancelled.\n"
                     "Back to Tournaments Menu..."
@@ -763,11 +787,13 @@ class Controller:
             else:
                 self.view.print("\nInvalid choice! Please try again.")
 
-    def enter_match_results(self, round_instance):
+    def enter_match_results(self, round_instance, precomputer=None):
         """
         Prompt the user to enter the results of the matches.
 
         :param round_instance: The round instance.
+        :param precomputer: The PairingPrecomputer of the next round, told
+            about each result, if any.
         """
         for match in round_instance.matches:
             while True:
@@ -775,18 +801,24 @@ class Controller:
                 choice = self.view.prompt_for_match_result()
                 if choice in ["0", "1", "2"]:
                     match.set_result(choice)
+                    if precomputer:
+                        precomputer.result_entered()
                     break
                 else:
                     self.view.print("Invalid choice! Please enter 0, 1, or 2.\n")
 
-    def finalize_tournament(self, tournament, ranked_players):
+    def finalize_tournament(self, tournament, ranked_players, tie_breaks=None):
         """
         Finalize the tournament and display results.
 
         :param tournament: The tournament instance.
         :param ranked_players: The list of ranked players.
+        :param tie_breaks: The tie-breaks of each player, keyed by national
+            chess ID.
         """
         tournament.set_end_date()
         self.view.print("Tournament ended !!!")
-        self.view.show_tournament_results(tournament, ranked_players)
-        tournament.save_tournament()
+        self.view.show_tournament_results(
+            tournament, ranked_players, tie_breaks
+        )
+        tournament.save_tournament(self.database)
@@ -0,0 +1,263 @@
+import os
+from contextlib import contextmanager
+
+from tinydb import TinyDB
+from tinydb.storages import MemoryStorage
+
+from .migrations import migrate, split_legacy_database
+from .players_index import PlayersIndex
+from .ratings import extract_games
+from .storages import (
+    AtomicArrayStorage, AtomicJSONStorage, TournamentStore,
+    UnitOfWorkMiddleware
+)
+from .tournament_summaries import TournamentSummaries, summarize
+
+
+class Database:
+    def __init__(self, directory="data"):
+        """
+        Initialize a Database instance.
+
+        The database is sharded in one directory:
+        - "players.json" holds the player registry,
+        - "catalog.json" holds the tournament summaries and the schema
+          version,
+        - "tournaments/<doc_id>.json" holds one tournament each,
+        - "games/<doc_id>.bin" caches the games of one tournament as arrays
+          for the rating recompute.
+
+        The files are only opened on first use, so commands that never touch
+        storage never open them. The Database is shared by the models and
+        the controller, which receive this object instead of opening their
+        own handle.
+
+        :param directory: The directory of the database files, or None to
+            keep the whole database in memory (useful for tests and
+            benchmarks).
+        """
+        self.directory = directory
+        self._players_db = None
+        self._catalog_db = None
+        self._tournament_store = None
+        self._games_store = None
+        self._players_index = None
+        self._tournament_summaries = None
+
+    def _open(self):
+        """
+        Open the database files, split a legacy single-file database and
+        apply pending migrations.
+        """
+        if self.directory is None:
+            self._players_db = TinyDB(
+                storage=UnitOfWorkMiddleware(MemoryStorage)
+            )
+            self._catalog_db = TinyDB(
+                storage=UnitOfWorkMiddleware(MemoryStorage)
+            )
+            self._tournament_store = TournamentStore()
+            self._games_store = TournamentStore()
+        else:
+            self._players_db = TinyDB(
+                os.path.join(self.directory, "players.json"),
+                storage=UnitOfWorkMiddleware(AtomicJSONStorage)
+            )
+            self._catalog_db = TinyDB(
+                os.path.join(self.directory, "catalog.json"),
+                storage=UnitOfWorkMiddleware(AtomicJSONStorage)
+            )
+            self._tournament_store = TournamentStore(
+                os.path.join(self.directory, "tournaments")
+            )
+            self._games_store = TournamentStore(
+                os.path.join(self.directory, "games"), AtomicArrayStorage,
+                "bin"
+            )
+
+            legacy_path = os.path.join(self.directory, "db.json")
+            if os.path.exists(legacy_path) and not os.path.exists(
+                os.path.join(self.directory, "catalog.json")
+            ):
+                split_legacy_database(self, legacy_path)
+
+        migrate(self)
+
+    @property
+    def players_db(self):
+        """
+        Return the TinyDB handle of the player registry.
+
+        :return: The TinyDB instance.
+        """
+        if self._players_db is None:
+            self._open()
+        return self._players_db
+
+    @property
+    def catalog_db(self):
+        """
+        Return the TinyDB handle of the catalog.
+
+        :return: The TinyDB instance.
+        """
+        if self._catalog_db is None:
+            self._open()
+        return self._catalog_db
+
+    @property
+    def tournament_store(self):
+        """
+        Return the store of the tournament files.
+
+        :return: The TournamentStore instance.
+        """
+        if self._tournament_store is None:
+            self._open()
+        return self._tournament_store
+
+    @property
+    def games_store(self):
+        """
+        Return the store of the games files.
+
+        :return: The TournamentStore instance.
+        """
+        if self._games_store is None:
+            self._open()
+        return self._games_store
+
+    @property
+    def players_index(self):
+        """
+        Return the national chess ID index of the "players" table.
+
+        :return: The PlayersIndex instance.
+        """
+        if self._players_index is None:
+            self._players_index = PlayersIndex(
+                self.players_db.table("players")
+            )
+        return self._players_index
+
+    @property
+    def tournament_summaries(self):
+        """
+        Return the tournament summaries of the catalog.
+
+        :return: The TournamentSummaries instance.
+        """
+        if self._tournament_summaries is None:
+            self._tournament_summaries = TournamentSummaries(
+                self.catalog_db.table("tournament_summaries")
+            )
+        return self._tournament_summaries
+
+    def get_tournament(self, doc_id):
+        """
+        Load a tournament document.
+
+        :param doc_id: The document ID of the tournament.
+        :return: The tournament document or None if it does not exist.
+        """
+        if doc_id not in self.tournament_summaries:
+            return None
+        return self.tournament_store.read(doc_id)
+
+    def all_tournaments(self):
+        """
+        Iterate over every tournament document, one file at a time.
+
+        :return: A generator of (doc_id, tournament document) tuples.
+        """
+        for doc_id in self.tournament_summaries.doc_ids():
+            yield doc_id, self.tournament_store.read(doc_id)
+
+    def all_tournament_games(self):
+        """
+        Iterate over the games of every tournament, as arrays. The games file
+        of a tournament is removed whenever the tournament is saved, and
+        rebuilt from the tournament document on next use.
+
+        :return: A generator of (doc_id, games) tuples, the games as returned
+            by extract_games.
+        """
+        for doc_id in self.tournament_summaries.doc_ids():
+            games = self.games_store.read(doc_id)
+            if games is None:
+                games = extract_games(self.tournament_store.read(doc_id))
+                self.games_store.write(doc_id, games)
+            yield doc_id, games
+
+    def insert_tournament(self, tournament_data):
+        """
+        Insert a new tournament document and its summary.
+
+        :param tournament_data: The serialized tournament.
+        :return: The document ID of the new tournament.
+        """
+        with self.unit_of_work():
+            doc_id = self.tournament_summaries.insert(
+                summarize(tournament_data)
+            )
+            self.tournament_store.write(doc_id, tournament_data)
+            self.games_store.remove(doc_id)
+        return doc_id
+
+    def update_tournament(self, doc_id, tournament_data):
+        """
+        Replace a tournament document and update its summary.
+
+        :param doc_id: The document ID of the tournament.
+        :param tournament_data: The serialized tournament.
+        """
+        with self.unit_of_work():
+            self.tournament_summaries.save(doc_id, summarize(tournament_data))
+            self.tournament_store.write(doc_id, tournament_data)
+            self.games_store.remove(doc_id)
+
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Buffer every database mutation made inside the block and write them
+        when the block exits, each file in one atomic write. Tournament files
+        are written before the catalog that references them. If the block
+        raises, its mutations are discarded: nothing is written if it was the
+        outermost unit of work, and an enclosing unit of work that catches
+        the exception keeps its own mutations.
+        """
+        storages = [
+            self.tournament_store,
+            self.games_store,
+            self.players_db.storage,
+            self.catalog_db.storage
+        ]
+        for storage in storages:
+            storage.begin()
+        try:
+            yield self
+        except BaseException:
+            for storage in storages:
+                storage.rollback()
+            for tinydb in (self._players_db, self._catalog_db):
+                for table_name in tinydb.tables():
+                    tinydb.table(table_name).clear_cache()
+            if self._players_index is not None:
+                self._players_index.reset()
+            raise
+        for storage in storages:
+            storage.commit()
+
+    def close(self):
+        """
+        Close the database files if they were opened.
+        """
+        if self._players_db is not None:
+            self._players_db.close()
+            self._catalog_db.close()
+        self._players_db = None
+        self._catalog_db = None
+        self._tournament_store = None
+        self._games_store = None
+        self._players_index = None
+        self._tournament_summaries = None
@@ -0,0 +1,155 @@
+import csv
+import json
+import os
+
+from .player_import import PLAYER_FIELDS
+
+MATCH_FIELDS = (
+    "tournament_id", "tournament_name", "location", "tournament_start_date",
+    "tournament_end_date", "round_number", "round_name", "round_start_date",
+    "round_end_date", "board", "player_1_national_chess_id",
+    "player_1_name", "player_1_surname", "player_1_match_score",
+    "player_2_national_chess_id", "player_2_name", "player_2_surname",
+    "player_2_match_score",
+)
+
+
+def iter_player_records(database):
+    """
+    Iterate over the registered players in alphabetical order.
+
+    :param database: The Database instance.
+    :return: A generator of player records.
+    """
+    for player_data in database.players_index.sorted_all():
+        yield {field: player_data[field] for field in PLAYER_FIELDS}
+
+
+def iter_match_records(database):
+    """
+    Iterate over every match of every stored tournament, flattened with its
+    tournament and round. A bye is exported as a last board without second
+    player. Tournaments are loaded one file at a time, so memory use does
+    not grow with the size of the archive.
+
+    :param database: The Database instance.
+    :return: A generator of match records.
+    """
+    for doc_id, tournament_data in database.all_tournaments():
+        players_by_id = {
+            player_data["national_chess_id"]: player_data
+            for player_data in tournament_data["players"]
+        }
+        tournament_record = {
+            "tournament_id": doc_id,
+            "tournament_name": tournament_data["name"],
+            "location": tournament_data["location"],
+            "tournament_start_date": tournament_data.get("start_date"),
+            "tournament_end_date": tournament_data.get("end_date"),
+        }
+
+        for round_number, round_data in enumerate(
+            tournament_data["rounds"], start=1
+        ):
+            round_record = dict(
+                tournament_record,
+                round_number=round_number,
+                round_name=round_data["round_name"],
+                round_start_date=round_data.get("start_date"),
+                round_end_date=round_data.get("end_date"),
+            )
+
+            for board, match_data in enumerate(
+                round_data["matches"], start=1
+            ):
+                (
+                    player_1_id, player_1_match_score,
+                    player_2_id, player_2_match_score
+                ) = match_data
+                player_1_data = players_by_id.get(player_1_id, {})
+                player_2_data = players_by_id.get(player_2_id, {})
+                yield dict(
+                    round_record,
+                    board=board,
+                    player_1_national_chess_id=player_1_id,
+                    player_1_name=player_1_data.get("name"),
+                    player_1_surname=player_1_data.get("surname"),
+                    player_1_match_score=player_1_match_score,
+                    player_2_national_chess_id=player_2_id,
+                    player_2_name=player_2_data.get("name"),
+                    player_2_surname=player_2_data.get("surname"),
+                    player_2_match_score=player_2_match_score,
+                )
+
+            bye_data = round_data.get("bye")
+            if bye_data:
+                player_data = players_by_id.get(bye_data["player"], {})
+                yield dict(
+                    round_record,
+                    board=len(round_data["matches"]) + 1,
+                    player_1_national_chess_id=bye_data["player"],
+                    player_1_name=player_data.get("name"),
+                    player_1_surname=player_data.get("surname"),
+                    player_1_match_score=bye_data["score"],
+                    player_2_national_chess_id=None,
+                    player_2_name=None,
+                    player_2_surname=None,
+                    player_2_match_score=None,
+                )
+
+
+def write_ndjson(records, handle):
+    """
+    Write records as newline-delimited JSON, one record at a time.
+
+    :param records: An iterable of records.
+    :param handle: The text file to write to.
+    :return: The number of records written.
+    """
+    count = 0
+    for record in records:
+        handle.write(json.dumps(record))
+        handle.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(records, handle, fieldnames):
+    """
+    Write records as CSV with a header line, one record at a time.
+
+    :param records: An iterable of records.
+    :param handle: The text file to write to.
+    :param fieldnames: The columns of the CSV file.
+    :return: The number of records written.
+    """
+    writer = csv.DictWriter(handle, fieldnames=fieldnames)
+    writer.writeheader()
+    count = 0
+    for record in records:
+        writer.writerow(record)
+        count += 1
+    return count
+
+
+def export_records(records, path, fieldnames):
+    """
+    Stream records to a CSV or NDJSON file, choosing the format from the
+    file extension (.csv, .ndjson or .jsonl).
+
+    :param records: An iterable of records.
+    :param path: The path of the file to write.
+    :param fieldnames: The columns used for CSV files.
+    :return: The number of records written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            return write_csv(records, handle, fieldnames)
+    if extension in (".ndjson", ".jsonl"):
+        with open(path, "w", encoding="utf-8") as handle:
+            return write_ndjson(records, handle)
+    raise ValueError(
+        f"Unsupported file type '{extension}', "
+        "expected one of .csv, .ndjson, .jsonl."
+    )
@@ -0,0 +1,100 @@
+class LazyRounds:
+    __slots__ = ("_rounds", "_rounds_data", "_materialize")
+
+    def __init__(self, rounds=None, rounds_data=None, materialize=None):
+        """
+        Initialize a LazyRounds instance.
+
+        A sequence of the rounds of a tournament that keeps loaded rounds as
+        their serialized dictionaries and only converts a round to a Round
+        instance, with its matches, when it is accessed. Opening a
+        tournament to look at its information or edit its players never
+        converts its rounds.
+
+        :param rounds: A list of Round instances.
+        :param rounds_data: A list of serialized rounds, used instead of
+            rounds.
+        :param materialize: The callable converting a serialized round to a
+            Round instance, required with rounds_data.
+        """
+        if rounds_data is not None:
+            self._rounds = len(rounds_data) * [None]
+            self._rounds_data = list(rounds_data)
+        else:
+            self._rounds = list(rounds or [])
+            self._rounds_data = len(self._rounds) * [None]
+        self._materialize = materialize
+
+    def __len__(self):
+        """
+        Return the number of rounds, without converting them.
+
+        :return: The number of rounds.
+        """
+        return len(self._rounds)
+
+    def __getitem__(self, index):
+        """
+        Return a round, or a list of rounds for a slice, converting them on
+        first access.
+
+        :param index: The index or slice of the rounds.
+        :return: The Round instance or a list of Round instances.
+        """
+        if isinstance(index, slice):
+            return [
+                self._get(position)
+                for position in range(*index.indices(len(self._rounds)))
+            ]
+        if index < 0:
+            index += len(self._rounds)
+        if not 0 <= index < len(self._rounds):
+            raise IndexError("round index out of range")
+        return self._get(index)
+
+    def __iter__(self):
+        """
+        Iterate over the rounds in order, converting them on first access.
+
+        :return: An iterator of Round instances.
+        """
+        for position in range(len(self._rounds)):
+            yield self._get(position)
+
+    def _get(self, position):
+        """
+        Return the round at a position, converting it if needed.
+
+        :param position: The position of the round.
+        :return: The Round instance.
+        """
+        round_instance = self._rounds[position]
+        if round_instance is None:
+            round_instance = self._materialize(self._rounds_data[position])
+            self._rounds[position] = round_instance
+            self._rounds_data[position] = None
+        return round_instance
+
+    def append(self, round_instance):
+        """
+        Add a new round.
+
+        :param round_instance: The Round instance.
+        """
+        self._rounds.append(round_instance)
+        self._rounds_data.append(None)
+
+    def to_dict(self):
+        """
+        Serialize the rounds. Rounds that were never converted are returned
+        as loaded, without converting them.
+
+        :return: A list of serialized rounds.
+        """
+        return [
+            round_data if round_instance is None
+            else round_instance.to_dict()
+            for round_instance, round_data in zip(
+                self._rounds, self._rounds_data
+            )
+        ]
@@ -1,4 +1,9 @@
 class Match:
+    __slots__ = (
+        "player_1", "player_2", "player_1_match_score",
+        "player_2_match_score", "_serialized"
+    )
+
     def __init__(
             self, player_1,
             player_2,
@@ -16,17 +21,60 @@ class Match:
         self.player_2 = player_2
         self.player_1_match_score = player_1_match_score
         self.player_2_match_score = player_2_match_score
+        self._serialized = None
+
+    @classmethod
+    def from_dict(cls, match_data, identity_map):
+        """
+        Create a match from its flat serialized form.
+
+        Players are resolved through the identity map, so every match shares
+        the Player instances of the tournament, including players removed
+        from the tournament after playing. The loaded data is kept as the
+        up-to-date serialized form of the match.
+
+        :param match_data: The serialized match, a list [player 1 national
+            chess ID, player 1 match score, player 2 national chess ID,
+            player 2 match score].
+        :param identity_map: The PlayerIdentityMap of the tournament.
+        :return: The Match instance.
+        """
+        match = cls.__new__(cls)
+        (
+            player_1_id, match.player_1_match_score,
+            player_2_id, match.player_2_match_score
+        ) = match_data
+        match.player_1 = identity_map.get(player_1_id)
+        match.player_2 = identity_map.get(player_2_id)
+        match._serialized = match_data
+        return match
+
+    def to_dict(self):
+        """
+        Serialize the match data to its flat form, a list [player 1 national
+        chess ID, player 1 match score, player 2 national chess ID, player 2
+        match score].
+
+        Players are referenced by their national chess ID, the player records
+        themselves are stored once in the tournament. The result is cached
+        until the match changes.
+
+        :return: A list representation of the match.
+        """
+        if self._serialized is None:
+            self._serialized = [
+                self.player_1.national_chess_id, self.player_1_match_score,
+                self.player_2.national_chess_id, self.player_2_match_score
+            ]
+        return self._serialized
 
-    def serialize(self):
+    def is_dirty(self):
         """
-        Serialize the match data to a tuple.
+        Check whether the match changed since it was last serialized.
 
-        :return: A tuple representation of the match.
+        :return: True if the match has no up-to-date serialized form.
         """
-        return (
-            [{"player_1": self.player_1.serialize(), "player_1_match_score": self.player_1_match_score}],
-            [{"player_2": self.player_2.serialize(), "player_2_match_score": self.player_2_match_score}]
-        )
+        return self._serialized is None
 
     def set_result(self, result):
         """
@@ -36,6 +84,7 @@ class Match:
             (1 for player 1 win, 2 for player 2 win, 0 for draw).
         """
         result = int(result)
+        self._serialized = None
         if result == 1:
             self.player_1_match_score += 1
             self.player_1.score += 1
@@ -0,0 +1,193 @@
+import os
+
+from tinydb import TinyDB
+from tinydb.table import Document
+
+from .storages import AtomicJSONStorage
+from .tournament_summaries import summarize
+
+SCHEMA_VERSION = 4
+
+
+def get_schema_version(database):
+    """
+    Return the schema version stored in the "meta" table.
+
+    :param database: The Database instance.
+    :return: The schema version, 1 for databases created before versioning.
+    """
+    meta = database.catalog_db.table("meta").get(doc_id=1)
+    return meta["schema_version"] if meta else 1
+
+
+def set_schema_version(database, schema_version):
+    """
+    Store the schema version in the "meta" table.
+
+    :param database: The Database instance.
+    :param schema_version: The schema version to store.
+    """
+    meta_table = database.catalog_db.table("meta")
+    if meta_table.get(doc_id=1):
+        meta_table.update(
+            {"schema_version": schema_version}, doc_ids=[1]
+        )
+    else:
+        meta_table.insert({"schema_version": schema_version})
+
+
+def normalize_match(match_data):
+    """
+    Replace the embedded player records of a serialized match by their
+    national chess ID.
+
+    :param match_data: The serialized match.
+    :return: The normalized serialized match.
+    """
+    player_1_data = match_data[0][0]
+    player_2_data = match_data[1][0]
+    player_1 = player_1_data["player_1"]
+    player_2 = player_2_data["player_2"]
+    return (
+        [{
+            "player_1": (
+                player_1["national_chess_id"]
+                if isinstance(player_1, dict)
+                else player_1
+            ),
+            "player_1_match_score": player_1_data["player_1_match_score"]
+        }],
+        [{
+            "player_2": (
+                player_2["national_chess_id"]
+                if isinstance(player_2, dict)
+                else player_2
+            ),
+            "player_2_match_score": player_2_data["player_2_match_score"]
+        }]
+    )
+
+
+def migrate_normalized_matches(database):
+    """
+    Migrate the tournaments to the normalized format, where matches
+    reference players by national chess ID instead of embedding them.
+
+    :param database: The Database instance.
+    """
+    for doc_id, tournament_data in database.all_tournaments():
+        rounds = [
+            dict(
+                round_data,
+                matches=[
+                    normalize_match(match_data)
+                    for match_data in round_data["matches"]
+                ]
+            )
+            for round_data in tournament_data.get("rounds", [])
+        ]
+        database.update_tournament(
+            doc_id, dict(tournament_data, rounds=rounds)
+        )
+
+
+def migrate_tournament_summaries(database):
+    """
+    Build the "tournament_summaries" projection of the existing tournaments.
+
+    :param database: The Database instance.
+    """
+    database.tournament_summaries.rebuild(database.all_tournaments())
+
+
+def flatten_match(match_data):
+    """
+    Convert a normalized serialized match to the flat format, a list
+    [player 1 national chess ID, player 1 match score, player 2 national
+    chess ID, player 2 match score].
+
+    :param match_data: The normalized serialized match.
+    :return: The flat serialized match.
+    """
+    player_1_data = match_data[0][0]
+    player_2_data = match_data[1][0]
+    return [
+        player_1_data["player_1"], player_1_data["player_1_match_score"],
+        player_2_data["player_2"], player_2_data["player_2_match_score"]
+    ]
+
+
+def migrate_flat_matches(database):
+    """
+    Migrate the matches of the tournaments to the flat format.
+
+    :param database: The Database instance.
+    """
+    for doc_id, tournament_data in database.all_tournaments():
+        rounds = [
+            dict(
+                round_data,
+                matches=[
+                    flatten_match(match_data)
+                    for match_data in round_data["matches"]
+                ]
+            )
+            for round_data in tournament_data.get("rounds", [])
+        ]
+        database.update_tournament(
+            doc_id, dict(tournament_data, rounds=rounds)
+        )
+
+
+MIGRATIONS = {
+    2: migrate_normalized_matches,
+    3: migrate_tournament_summaries,
+    4: migrate_flat_matches,
+}
+
+
+def migrate(database):
+    """
+    Apply every pending migration to the database in a single unit of work.
+
+    :param database: The Database instance.
+    """
+    schema_version = get_schema_version(database)
+    if schema_version >= SCHEMA_VERSION:
+        return
+
+    with database.unit_of_work():
+        for version in range(schema_version + 1, SCHEMA_VERSION + 1):
+            MIGRATIONS[version](database)
+        set_schema_version(database, SCHEMA_VERSION)
+
+
+def split_legacy_database(database, legacy_path):
+    """
+    Split a legacy single-file database into the sharded layout: the player
+    registry, the catalog and one file per tournament. The legacy file is
+    kept next to the new ones with a ".bak" suffix.
+
+    :param database: The Database instance, opened on the new layout.
+    :param legacy_path: The path of the legacy single-file database.
+    """
+    legacy_db = TinyDB(legacy_path, storage=AtomicJSONStorage)
+    legacy_meta = legacy_db.table("meta").get(doc_id=1)
+
+    with database.unit_of_work():
+        database.players_db.table("players").insert_multiple(
+            Document(player_data, doc_id=player_data.doc_id)
+            for player_data in legacy_db.table("players").all()
+        )
+        for tournament_data in legacy_db.table("tournaments").all():
+            doc_id = tournament_data.doc_id
+            database.tournament_summaries.save(
+                doc_id, summarize(tournament_data)
+            )
+            database.tournament_store.write(doc_id, dict(tournament_data))
+        set_schema_version(
+            database, legacy_meta["schema_version"] if legacy_meta else 1
+        )
+
+    legacy_db.close()
+    os.replace(legacy_path, f"{legacy_path}.bak")
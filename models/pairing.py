@@ -0,0 +1,1029 @@
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+INITIAL_WINDOW = 16
+MAX_WINDOW_EXPANSIONS = 2
+PAIRING_BLOCK_SIZE = 200
+DUTCH_TIME_BUDGET = 1.0
+DUTCH_NODES_PER_PLAYER = 64
+DUTCH_MAX_EXCHANGES = 32
+PARALLEL_DEADLINE = 2.0
+PARALLEL_LOOKAHEAD = 3
+
+
+def max_weight_matching(edges, max_cardinality=False):
+    """
+    Compute a maximum-weight matching of a general undirected graph with
+    Edmonds' blossom algorithm, in O(n^3) time.
+
+    This follows the primal-dual method of Galil ("Efficient algorithms for
+    finding maximum matching in graphs", 1986), as popularised by Joris van
+    Rantwijk's reference implementation. Weights should be even integers so
+    that every computation stays exact.
+
+    :param edges: A list of (i, j, weight) tuples, vertices are the integers
+        0 to n-1.
+    :param max_cardinality: If True, only maximum-cardinality matchings are
+        considered, and the heaviest of them is returned.
+    :return: A list mate where mate[i] is the vertex matched to i, or -1.
+    """
+    if not edges:
+        return []
+
+    edge_count = len(edges)
+    vertex_count = 1 + max(max(i, j) for i, j, _ in edges)
+    max_weight = max(0, max(weight for _, _, weight in edges))
+
+    # endpoint[p] is the vertex at endpoint p, edge k has endpoints 2k, 2k+1
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * edge_count)]
+    neighbour_ends = [[] for _ in range(vertex_count)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbour_ends[i].append(2 * k + 1)
+        neighbour_ends[j].append(2 * k)
+
+    # mate[v] is the remote endpoint of the matched edge of v, or -1
+    mate = vertex_count * [-1]
+    # label of top-level blossoms: 0 free, 1 S-blossom, 2 T-blossom
+    label = (2 * vertex_count) * [0]
+    label_end = (2 * vertex_count) * [-1]
+    in_blossom = list(range(vertex_count))
+    blossom_parent = (2 * vertex_count) * [-1]
+    blossom_children = (2 * vertex_count) * [None]
+    blossom_base = list(range(vertex_count)) + vertex_count * [-1]
+    blossom_endpoints = (2 * vertex_count) * [None]
+    # flat list of the vertices of each blossom, avoids walking nested
+    # blossoms recursively
+    leaves = [[v] for v in range(vertex_count)] + vertex_count * [None]
+    best_edge = (2 * vertex_count) * [-1]
+    blossom_best_edges = (2 * vertex_count) * [None]
+    unused_blossoms = list(range(vertex_count, 2 * vertex_count))
+    dual = vertex_count * [max_weight] + vertex_count * [0]
+    allowed = edge_count * [False]
+    queue = []
+
+    def slack(k):
+        i, j, weight = edges[k]
+        return dual[i] + dual[j] - 2 * weight
+
+    def blossom_leaves(b):
+        return leaves[b]
+
+    def assign_label(w, t, p):
+        b = in_blossom[w]
+        label[w] = label[b] = t
+        label_end[w] = label_end[b] = p
+        best_edge[w] = best_edge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossom_base[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        # Trace back from v and w to find a new blossom base or an
+        # augmenting path, return the base or -1.
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = in_blossom[v]
+            if label[b] & 4:
+                base = blossom_base[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if label_end[b] == -1:
+                v = -1
+            else:
+                v = endpoint[label_end[b]]
+                b = in_blossom[v]
+                v = endpoint[label_end[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        v, w, _ = edges[k]
+        base_blossom = in_blossom[base]
+        bv = in_blossom[v]
+        bw = in_blossom[w]
+        b = unused_blossoms.pop()
+        blossom_base[b] = base
+        blossom_parent[b] = -1
+        blossom_parent[base_blossom] = b
+        blossom_children[b] = path = []
+        blossom_endpoints[b] = endpoints = []
+        while bv != base_blossom:
+            blossom_parent[bv] = b
+            path.append(bv)
+            endpoints.append(label_end[bv])
+            v = endpoint[label_end[bv]]
+            bv = in_blossom[v]
+        path.append(base_blossom)
+        path.reverse()
+        endpoints.reverse()
+        endpoints.append(2 * k)
+        while bw != base_blossom:
+            blossom_parent[bw] = b
+            path.append(bw)
+            endpoints.append(label_end[bw] ^ 1)
+            w = endpoint[label_end[bw]]
+            bw = in_blossom[w]
+        leaves[b] = [v for child in path for v in leaves[child]]
+        label[b] = 1
+        label_end[b] = label_end[base_blossom]
+        dual[b] = 0
+        for v in blossom_leaves(b):
+            if label[in_blossom[v]] == 2:
+                queue.append(v)
+            in_blossom[v] = b
+
+        best_edge_to = (2 * vertex_count) * [-1]
+        for bv in path:
+            if blossom_best_edges[bv] is None:
+                neighbour_lists = [
+                    [p // 2 for p in neighbour_ends[v]]
+                    for v in blossom_leaves(bv)
+                ]
+            else:
+                neighbour_lists = [blossom_best_edges[bv]]
+            for neighbour_list in neighbour_lists:
+                for k in neighbour_list:
+                    i, j, _ = edges[k]
+                    if in_blossom[j] == b:
+                        i, j = j, i
+                    bj = in_blossom[j]
+                    if (
+                        bj != b and label[bj] == 1
+                        and (
+                            best_edge_to[bj] == -1
+                            or slack(k) < slack(best_edge_to[bj])
+                        )
+                    ):
+                        best_edge_to[bj] = k
+            blossom_best_edges[bv] = None
+            best_edge[bv] = -1
+        blossom_best_edges[b] = [k for k in best_edge_to if k != -1]
+        best_edge[b] = -1
+        for k in blossom_best_edges[b]:
+            if best_edge[b] == -1 or slack(k) < slack(best_edge[b]):
+                best_edge[b] = k
+
+    def expand_blossom(b, end_stage):
+        for child in blossom_children[b]:
+            blossom_parent[child] = -1
+            if child < vertex_count:
+                in_blossom[child] = child
+            elif end_stage and dual[child] == 0:
+                expand_blossom(child, end_stage)
+            else:
+                for v in blossom_leaves(child):
+                    in_blossom[v] = child
+
+        if not end_stage and label[b] == 2:
+            # Relabel the children on the path from the entry child to the
+            # base, the T-blossom becomes an alternating path.
+            entry_child = in_blossom[endpoint[label_end[b] ^ 1]]
+            j = blossom_children[b].index(entry_child)
+            if j & 1:
+                j -= len(blossom_children[b])
+                step = 1
+                trick = 0
+            else:
+                step = -1
+                trick = 1
+            p = label_end[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[
+                    blossom_endpoints[b][j - trick] ^ trick ^ 1
+                ]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowed[blossom_endpoints[b][j - trick] // 2] = True
+                j += step
+                p = blossom_endpoints[b][j - trick] ^ trick
+                allowed[p // 2] = True
+                j += step
+            bv = blossom_children[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            label_end[endpoint[p ^ 1]] = label_end[bv] = p
+            best_edge[bv] = -1
+            j += step
+            while blossom_children[b][j] != entry_child:
+                bv = blossom_children[b][j]
+                if label[bv] == 1:
+                    j += step
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossom_base[bv]]]] = 0
+                    assign_label(v, 2, label_end[v])
+                j += step
+
+        label[b] = label_end[b] = -1
+        blossom_children[b] = blossom_endpoints[b] = None
+        blossom_base[b] = -1
+        blossom_best_edges[b] = None
+        best_edge[b] = -1
+        leaves[b] = None
+        unused_blossoms.append(b)
+
+    def augment_blossom(b, v):
+        # Swap matched and unmatched edges inside blossom b so that v
+        # becomes its base.
+        t = v
+        while blossom_parent[t] != b:
+            t = blossom_parent[t]
+        if t >= vertex_count:
+            augment_blossom(t, v)
+        i = j = blossom_children[b].index(t)
+        if i & 1:
+            j -= len(blossom_children[b])
+            step = 1
+            trick = 0
+        else:
+            step = -1
+            trick = 1
+        while j != 0:
+            j += step
+            t = blossom_children[b][j]
+            p = blossom_endpoints[b][j - trick] ^ trick
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p])
+            j += step
+            t = blossom_children[b][j]
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossom_children[b] = (
+            blossom_children[b][i:] + blossom_children[b][:i]
+        )
+        blossom_endpoints[b] = (
+            blossom_endpoints[b][i:] + blossom_endpoints[b][:i]
+        )
+        blossom_base[b] = blossom_base[blossom_children[b][0]]
+
+    def augment_matching(k):
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = in_blossom[s]
+                if bs >= vertex_count:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if label_end[bs] == -1:
+                    break
+                t = endpoint[label_end[bs]]
+                bt = in_blossom[t]
+                s = endpoint[label_end[bt]]
+                j = endpoint[label_end[bt] ^ 1]
+                if bt >= vertex_count:
+                    augment_blossom(bt, j)
+                mate[j] = label_end[bt]
+                p = label_end[bt] ^ 1
+
+    for _ in range(vertex_count):
+        # Each stage looks for one augmenting path.
+        label[:] = (2 * vertex_count) * [0]
+        best_edge[:] = (2 * vertex_count) * [-1]
+        blossom_best_edges[vertex_count:] = vertex_count * [None]
+        allowed[:] = edge_count * [False]
+        queue[:] = []
+        for v in range(vertex_count):
+            if mate[v] == -1 and label[in_blossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbour_ends[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if in_blossom[v] == in_blossom[w]:
+                        continue
+                    if not allowed[k]:
+                        i, j, weight = edges[k]
+                        k_slack = dual[i] + dual[j] - 2 * weight
+                        if k_slack <= 0:
+                            allowed[k] = True
+                    if allowed[k]:
+                        if label[in_blossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[in_blossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            label_end[w] = p ^ 1
+                    elif label[in_blossom[w]] == 1:
+                        b = in_blossom[v]
+                        if best_edge[b] == -1 or k_slack < slack(best_edge[b]):
+                            best_edge[b] = k
+                    elif label[w] == 0:
+                        if best_edge[w] == -1 or k_slack < slack(best_edge[w]):
+                            best_edge[w] = k
+
+            if augmented:
+                break
+
+            # No augmenting path with the current duals, compute the dual
+            # adjustment delta.
+            delta_type = -1
+            delta = delta_edge = delta_blossom = None
+            if not max_cardinality:
+                delta_type = 1
+                delta = min(dual[:vertex_count])
+            for v in range(vertex_count):
+                if label[in_blossom[v]] == 0 and best_edge[v] != -1:
+                    d = slack(best_edge[v])
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 2
+                        delta_edge = best_edge[v]
+            for b in range(2 * vertex_count):
+                if (
+                    blossom_parent[b] == -1 and label[b] == 1
+                    and best_edge[b] != -1
+                ):
+                    d = slack(best_edge[b]) // 2
+                    if delta_type == -1 or d < delta:
+                        delta = d
+                        delta_type = 3
+                        delta_edge = best_edge[b]
+            for b in range(vertex_count, 2 * vertex_count):
+                if (
+                    blossom_base[b] >= 0 and blossom_parent[b] == -1
+                    and label[b] == 2
+                    and (delta_type == -1 or dual[b] < delta)
+                ):
+                    delta = dual[b]
+                    delta_type = 4
+                    delta_blossom = b
+            if delta_type == -1:
+                delta_type = 1
+                delta = max(0, min(dual[:vertex_count]))
+
+            for v in range(vertex_count):
+                if label[in_blossom[v]] == 1:
+                    dual[v] -= delta
+                elif label[in_blossom[v]] == 2:
+                    dual[v] += delta
+            for b in range(vertex_count, 2 * vertex_count):
+                if blossom_base[b] >= 0 and blossom_parent[b] == -1:
+                    if label[b] == 1:
+                        dual[b] += delta
+                    elif label[b] == 2:
+                        dual[b] -= delta
+
+            if delta_type == 1:
+                break
+            elif delta_type == 2:
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                if label[in_blossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif delta_type == 3:
+                allowed[delta_edge] = True
+                i, j, _ = edges[delta_edge]
+                queue.append(i)
+            else:
+                expand_blossom(delta_blossom, False)
+
+        if not augmented:
+            break
+
+        for b in range(vertex_count, 2 * vertex_count):
+            if (
+                blossom_parent[b] == -1 and blossom_base[b] >= 0
+                and label[b] == 1 and dual[b] == 0
+            ):
+                expand_blossom(b, True)
+
+    for v in range(vertex_count):
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+    return mate
+
+
+def ranking_blocks(scores, block_size=PAIRING_BLOCK_SIZE):
+    """
+    Split a ranking into blocks of an even number of consecutive players,
+    about block_size each. A block ends where the score changes when
+    possible, so that score groups are not split.
+
+    :param scores: The doubled scores of the players, in ranking order.
+    :param block_size: The target number of players of a block.
+    :return: A list of (start, end) ranges covering the ranking.
+    """
+    count = len(scores)
+    blocks = []
+    start = 0
+    while count - start >= 2 * block_size:
+        target = start + block_size
+        boundaries = [
+            position
+            for position in range(
+                target - block_size // 2, target + block_size // 2 + 1, 2
+            )
+            if scores[position - 1] != scores[position]
+        ]
+        end = min(
+            boundaries, key=lambda position: abs(position - target),
+            default=target - target % 2
+        )
+        blocks.append((start, end))
+        start = end
+    blocks.append((start, count))
+    return blocks
+
+
+def weighted_matching(scores, played, window, had_bye=None):
+    """
+    Pair the players with a maximum-weight maximum-cardinality matching of
+    the graph connecting each player to the next window players of the
+    ranking. The weights of the graph are computed in one vectorized pass
+    over the "already played" matrix.
+
+    With an odd number of players, the bye is part of the matching: an extra
+    vertex is connected to every player, the player matched with it gets the
+    bye. A second bye costs as much as a rematch, then the bye goes to the
+    lowest score and the lowest ranked player.
+
+    :param scores: The doubled scores of the players, in ranking order.
+    :param played: Boolean matrix in ranking order, played[i, j] is True if
+        the players ranked i and j have already played each other.
+    :param window: The number of following players each player is
+        connected to.
+    :param had_bye: Boolean array in ranking order of the players who
+        already had a bye, required with an odd number of players.
+    :return: A tuple (pairs, bye), pairs holding (i, j) ranking positions
+        with i < j in board order, bye the position of the player getting
+        the bye or None.
+    """
+    count = len(scores)
+    max_score_gap = int(scores.max() - scores.min())
+    max_rank_cost = count * count
+    score_unit = (count // 2 + 1) * max_rank_cost + 1
+    rematch_unit = (count // 2 + 1) * (
+        score_unit * max_score_gap * max_score_gap + max_rank_cost
+    ) + 1
+    base = rematch_unit * 2
+    # exact Python integers if the weights could overflow 64 bits
+    dtype = np.int64 if 2 * base < 2 ** 62 else object
+
+    offsets = range(1, min(count, window + 1))
+    first = np.concatenate([np.arange(count - d) for d in offsets])
+    second = np.concatenate([np.arange(d, count) for d in offsets])
+    score_gaps = (scores[first] - scores[second]).astype(dtype)
+    rank_gaps = (second - first).astype(dtype)
+    costs = (
+        score_unit * score_gaps * score_gaps + rank_gaps * rank_gaps
+        + rematch_unit * played[first, second].astype(dtype)
+    )
+    if count % 2:
+        positions = np.arange(count)
+        bye_costs = (
+            score_unit * (scores - scores.min()).astype(dtype) ** 2
+            + (count - 1 - positions).astype(dtype) ** 2
+            + rematch_unit * had_bye.astype(dtype)
+        )
+        first = np.concatenate([first, positions])
+        second = np.concatenate([second, np.full(count, count)])
+        costs = np.concatenate([costs, bye_costs])
+    edges = list(zip(
+        first.tolist(), second.tolist(), (2 * (base - costs)).tolist()
+    ))
+    mate = max_weight_matching(edges, max_cardinality=True)
+    bye = mate[count] if count % 2 and mate[count] >= 0 else None
+    return [(i, j) for i, j in enumerate(mate) if i < j < count], bye
+
+
+def pair_block(scores, played, had_bye, complete):
+    """
+    Pair a block of consecutive players of the ranking, widening the window
+    at most MAX_WINDOW_EXPANSIONS times.
+
+    :param scores: The doubled scores of the players of the block.
+    :param played: The "already played" matrix of the block.
+    :param had_bye: Boolean array of the players of the block who already
+        had a bye.
+    :param complete: True if the block is the whole field: the complete
+        graph is then tried last, so a pairing is always returned.
+    :return: A tuple (pairs, bye) of positions in the block, like
+        weighted_matching, or None if no perfect pairing without rematch or
+        second bye was found.
+    """
+    count = len(scores)
+    for expansion in range(MAX_WINDOW_EXPANSIONS + 1):
+        window = INITIAL_WINDOW << expansion
+        pairs, bye = weighted_matching(scores, played, window, had_bye)
+        if (
+            len(pairs) == count // 2
+            and not any(played[i, j] for i, j in pairs)
+            and not (bye is not None and had_bye[bye])
+        ):
+            return pairs, bye
+        if window >= count - 1:
+            return (pairs, bye) if complete else None
+    if complete:
+        return weighted_matching(scores, played, count - 1, had_bye)
+    return None
+
+
+def pair_players(
+        players, player_indices, played, colour_balance=None, byes=()
+):
+    """
+    Pair players with a maximum-weight maximum-cardinality matching, so
+    that a pairing without rematches is found whenever one exists. With an
+    odd number of players, the bye is chosen by the same matching, see
+    weighted_matching.
+
+    Edge weights are strictly ordered penalties: a rematch costs more than
+    any combination of score differences, and a score difference costs more
+    than any combination of ranking distances, so among equivalent pairings
+    neighbours in the ranking play each other. The distinct ranking costs
+    also keep the matching problem from being degenerate, which keeps the
+    blossom algorithm fast on large score groups.
+
+    The blossom algorithm is superlinear, so the ranking is split into
+    blocks of about PAIRING_BLOCK_SIZE players paired independently. Within
+    a block, only players close in the ranking are connected, and the window
+    is widened a bounded number of times. A block that still has no perfect
+    pairing without rematch is merged with its neighbour and paired again;
+    only when the blocks have been merged into the whole field is the
+    complete graph tried. In the 9-round benchmark of a Swiss open, a round
+    is paired in well under a second up to about 1,000 players.
+
+    :param players: The players, ranked best first.
+    :param player_indices: Dict of the interned index per player ID.
+    :param played: Boolean matrix, played[i, j] is True if the players of
+        interned indices i and j have already played each other.
+    :param colour_balance: Not used by this pairing system.
+    :param byes: The national chess IDs of the players who already had a
+        bye.
+    :return: A list of (player_1, player_2) tuples in board order, the better
+        ranked player first. With an odd number of players, the player left
+        out gets the bye.
+    """
+    count = len(players)
+    if count < 2:
+        return []
+
+    order = np.array(
+        [player_indices[player.national_chess_id] for player in players]
+    )
+    # "already played" relation in ranking order
+    played = played[np.ix_(order, order)]
+    scores = np.rint(
+        2 * np.array([player.score for player in players])
+    ).astype(np.int64)
+    had_bye = np.array(
+        [player.national_chess_id in byes for player in players]
+    )
+
+    # only the last block has an odd number of players
+    pending = deque(ranking_blocks(scores))
+    solved = []
+    while pending:
+        start, end = pending.popleft()
+        result = pair_block(
+            scores[start:end], played[start:end, start:end],
+            had_bye[start:end], complete=end - start == count
+        )
+        if result is not None:
+            pairs, _ = result
+            solved.append((start, [(start + i, start + j) for i, j in pairs]))
+        elif pending:
+            _, next_end = pending.popleft()
+            pending.appendleft((start, next_end))
+        else:
+            previous_start, _ = solved.pop()
+            pending.appendleft((previous_start, end))
+    return [
+        (players[i], players[j])
+        for _, pairs in solved for i, j in pairs
+    ]
+
+
+def match_halves(top, bottom, played, node_limit):
+    """
+    Pair each player of the top half with a player of the bottom half they
+    have not played yet, with a depth-first search trying the bottom half in
+    ranking order: the first solution found is the standard pairing or its
+    smallest transposition.
+
+    Each top player only considers the opponents they have not played, and
+    a top player left without any opponent prunes the search at once. The
+    search gives up after node_limit steps.
+
+    :param top: The interned indices of the top half.
+    :param bottom: The interned indices of the bottom half.
+    :param played: The "already played" matrix.
+    :param node_limit: The maximum number of search steps.
+    :return: For each top player, the position of their opponent in the
+        bottom half, or None if no pairing was found.
+    """
+    if not top:
+        return []
+    candidates = [
+        [position for position, done in enumerate(row) if not done]
+        for row in played[np.ix_(top, bottom)].tolist()
+    ]
+    if not all(candidates):
+        return None
+
+    used = len(bottom) * [False]
+    chosen = len(top) * [-1]
+    next_option = len(top) * [0]
+    nodes = 0
+    level = 0
+    while 0 <= level < len(top):
+        if chosen[level] >= 0:
+            used[chosen[level]] = False
+            chosen[level] = -1
+        options = candidates[level]
+        option = next_option[level]
+        while option < len(options) and used[options[option]]:
+            option += 1
+        if option == len(options):
+            next_option[level] = 0
+            level -= 1
+            continue
+        nodes += 1
+        if nodes > node_limit:
+            return None
+        next_option[level] = option + 1
+        chosen[level] = options[option]
+        used[options[option]] = True
+        level += 1
+    return chosen if level == len(top) else None
+
+
+def score_group_splits(group_size, pair_count):
+    """
+    Generate the ways of splitting a score group in a top half and a bottom
+    half: the standard split first, then the exchanges of one player of each
+    half, the smallest exchanges first.
+
+    :param group_size: The number of players in the score group.
+    :param pair_count: The number of players in the top half.
+    :return: A generator of (top positions, bottom positions) tuples.
+    """
+    top = list(range(pair_count))
+    bottom = list(range(pair_count, group_size))
+    yield top, bottom
+
+    exchanges = sorted(
+        ((top_position, bottom_position)
+         for top_position in top for bottom_position in bottom),
+        key=lambda exchange: (exchange[1] - exchange[0], -exchange[0])
+    )
+    for top_position, bottom_position in exchanges[:DUTCH_MAX_EXCHANGES]:
+        yield (
+            [position for position in top if position != top_position]
+            + [bottom_position],
+            [top_position]
+            + [position for position in bottom if position != bottom_position]
+        )
+
+
+def pair_score_group(group, indices, played, deadline):
+    """
+    Pair as many players of a score group as possible without rematches.
+
+    :param group: The players of the group, downfloaters first then in
+        ranking order.
+    :param indices: The interned indices of the group players.
+    :param played: The "already played" matrix.
+    :param deadline: The time.perf_counter() value after which the search
+        is abandoned.
+    :return: A tuple (pairs, downfloaters), or None if the deadline passed.
+    """
+    node_limit = DUTCH_NODES_PER_PLAYER * len(group)
+    for pair_count in range(len(group) // 2, -1, -1):
+        for top, bottom in score_group_splits(len(group), pair_count):
+            if time.perf_counter() > deadline:
+                return None
+            chosen = match_halves(
+                [indices[position] for position in top],
+                [indices[position] for position in bottom],
+                played, node_limit
+            )
+            if chosen is None:
+                continue
+            pairs = [
+                (group[top_position], group[bottom[bottom_position]])
+                for top_position, bottom_position in zip(top, chosen)
+            ]
+            paired = set(chosen)
+            downfloaters = [
+                group[position]
+                for bottom_position, position in enumerate(bottom)
+                if bottom_position not in paired
+            ]
+            return pairs, downfloaters
+    return [], list(group)
+
+
+def pair_players_dutch(
+        players, player_indices, played, colour_balance=None, byes=(),
+        time_budget=DUTCH_TIME_BUDGET
+):
+    """
+    Pair players with a Dutch-style Swiss system.
+
+    Players are bucketed in score groups, paired from the highest score
+    down. Each group is split in two halves, the top half playing the bottom
+    half; transpositions of the bottom half and exchanges between the halves
+    are tried in order until no pair has already played. Players left
+    unpaired float down to the next group. The backtracking is bounded per
+    group and by a time budget. With an odd number of players, the player
+    left unpaired in the last group gets the bye.
+
+    If the budget runs out, or the last group cannot be paired without a
+    rematch or leaves out a player who already had a bye, the remaining
+    players are paired with the maximum-weight matching instead (the whole
+    field if that still gives a rematch or a second bye), so large groups
+    never trigger an exponential search.
+
+    :param players: The players, ranked best first.
+    :param player_indices: Dict of the interned index per player ID.
+    :param played: Boolean "already played" matrix of interned indices.
+    :param colour_balance: Not used by this pairing system.
+    :param byes: The national chess IDs of the players who already had a
+        bye.
+    :param time_budget: The maximum time spent searching, in seconds.
+    :return: A list of (player_1, player_2) tuples in board order. With an
+        odd number of players, the player left out gets the bye.
+    """
+    deadline = time.perf_counter() + time_budget
+    score_groups = {}
+    for player in players:
+        score_groups.setdefault(player.score, []).append(player)
+    scores = sorted(score_groups, reverse=True)
+
+    pairs = []
+    downfloaters = []
+    for number, score in enumerate(scores):
+        group = downfloaters + score_groups[score]
+        result = pair_score_group(
+            group,
+            [player_indices[player.national_chess_id] for player in group],
+            played, deadline
+        )
+        is_last = number == len(scores) - 1
+        if result is None or is_last and not (
+            len(result[1]) == len(players) % 2
+            and not any(
+                player.national_chess_id in byes for player in result[1]
+            )
+        ):
+            remaining = group + [
+                player for lower_score in scores[number + 1:]
+                for player in score_groups[lower_score]
+            ]
+            break
+        group_pairs, downfloaters = result
+        pairs.extend(group_pairs)
+    else:
+        return pairs
+
+    remaining_pairs = pair_players(
+        remaining, player_indices, played, byes=byes
+    )
+    paired = {
+        player.national_chess_id
+        for pair in remaining_pairs for player in pair
+    }
+    if any(
+        played[player_indices[player_1.national_chess_id],
+               player_indices[player_2.national_chess_id]]
+        for player_1, player_2 in remaining_pairs
+    ) or any(
+        player.national_chess_id not in paired
+        and player.national_chess_id in byes
+        for player in remaining
+    ):
+        return pair_players(players, player_indices, played, byes=byes)
+    return pairs + remaining_pairs
+
+
+def random_pairing(scores, played, colour_balance, had_bye, rng):
+    """
+    Build one randomized pairing: players are ordered by score with random
+    ties, and each player in turn plays one of the next few players of that
+    order they have not played yet, picked at random. With an odd number of
+    players, the bye goes first to one of the last few players of that
+    order who have not had a bye yet, picked at random; a second bye counts
+    as a rematch.
+
+    :param scores: The doubled score of each player, as integers.
+    :param played: The "already played" relation as nested lists.
+    :param colour_balance: The number of white games minus black games of
+        each player.
+    :param had_bye: Whether each player already had a bye.
+    :param rng: The random.Random instance of the attempt.
+    :return: A tuple (cost, pairs), pairs holding (white, black) positions.
+    """
+    order = sorted(
+        range(len(scores)), key=lambda i: (-scores[i], rng.random())
+    )
+    pairs = []
+    rematches = score_spread = colour_penalty = 0
+    if len(order) % 2:
+        candidates = [
+            position for position in range(len(order) - 1, -1, -1)
+            if not had_bye[order[position]]
+        ][:PARALLEL_LOOKAHEAD]
+        if candidates:
+            bye = order.pop(rng.choice(candidates))
+        else:
+            bye = order.pop()
+            rematches += 1
+        score_spread += (scores[bye] - min(scores)) ** 2
+    while len(order) > 1:
+        player = order.pop(0)
+        candidates = []
+        for position, opponent in enumerate(order):
+            if not played[player][opponent]:
+                candidates.append(position)
+                if len(candidates) == PARALLEL_LOOKAHEAD:
+                    break
+        if candidates:
+            opponent = order.pop(rng.choice(candidates))
+        else:
+            opponent = order.pop(0)
+            rematches += 1
+        score_spread += (scores[player] - scores[opponent]) ** 2
+
+        if colour_balance[opponent] < colour_balance[player]:
+            player, opponent = opponent, player
+        colour_penalty += (
+            max(0, abs(colour_balance[player] + 1) - 1)
+            + max(0, abs(colour_balance[opponent] - 1) - 1)
+        )
+        pairs.append((player, opponent))
+    return (rematches, score_spread, colour_penalty), pairs
+
+
+def random_pairing_search(
+        scores, played, colour_balance, had_bye, seed, deadline
+):
+    """
+    Build randomized pairings until the deadline and keep the best one.
+
+    This runs in a worker process, so it only receives plain lists.
+
+    :param scores: The doubled score of each player, as integers.
+    :param played: The "already played" relation as nested lists.
+    :param colour_balance: The colour balance of each player.
+    :param had_bye: Whether each player already had a bye.
+    :param seed: The seed of the attempts.
+    :param deadline: The time.time() value at which the search stops, at
+        least one pairing is always built.
+    :return: A tuple (cost, pairs) of the best pairing found.
+    """
+    rng = random.Random(seed)
+    best = None
+    while True:
+        candidate = random_pairing(
+            scores, played, colour_balance, had_bye, rng
+        )
+        if best is None or candidate[0] < best[0]:
+            best = candidate
+        if best[0] == (0, 0, 0) or time.time() >= deadline:
+            return best
+
+
+def pair_players_parallel(
+        players, player_indices, played, colour_balance=None, byes=(),
+        deadline=PARALLEL_DEADLINE, workers=None
+):
+    """
+    Pair players with many seeded randomized attempts run on every core,
+    and keep the best pairing found before the deadline.
+
+    Pairings are compared on their number of rematches first, then on
+    their score spread (sum of the squared score differences) and then on
+    their colour balance (games moving a player more than one colour away
+    from even). The player with fewer white games plays white, as
+    player_1. With an odd number of players, each attempt picks the bye, see
+    random_pairing.
+
+    If no process pool can be started, the search runs in this process.
+
+    :param players: The players, ranked best first.
+    :param player_indices: Dict of the interned index per player ID.
+    :param played: Boolean "already played" matrix of interned indices.
+    :param colour_balance: Array of the number of white games minus black
+        games per interned index, or None if colours are not tracked.
+    :param byes: The national chess IDs of the players who already had a
+        bye.
+    :param deadline: The wall-clock time of the search, in seconds.
+    :param workers: The number of worker processes, every core by default.
+    :return: A list of (white, black) tuples in board order. With an odd
+        number of players, the player left out gets the bye.
+    """
+    count = len(players)
+    if count < 2:
+        return []
+
+    order = np.array(
+        [player_indices[player.national_chess_id] for player in players]
+    )
+    scores = np.rint(
+        2 * np.array([player.score for player in players])
+    ).astype(np.int64).tolist()
+    played_rows = played[np.ix_(order, order)].tolist()
+    balances = (
+        colour_balance[order].tolist() if colour_balance is not None
+        else count * [0]
+    )
+    had_bye = [player.national_chess_id in byes for player in players]
+    workers = workers or os.cpu_count() or 1
+    end = time.time() + deadline
+    seed = random.getrandbits(32)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    random_pairing_search, scores, played_rows, balances,
+                    had_bye, seed + worker, end
+                )
+                for worker in range(workers)
+            ]
+            results = [future.result() for future in futures]
+    except (OSError, BrokenProcessPool):
+        results = [
+            random_pairing_search(
+                scores, played_rows, balances, had_bye, seed, end
+            )
+        ]
+
+    _, pairs = min(results, key=lambda result: result[0])
+    pairs.sort(key=lambda pair: (
+        -max(scores[pair[0]], scores[pair[1]]), min(pair)
+    ))
+    return [(players[white], players[black]) for white, black in pairs]
+
+
+def berger_schedule(player_count):
+    """
+    Compute the full schedule of a round-robin tournament with the Berger
+    tables: every player meets every other player exactly once.
+
+    With an odd number of players a dummy player is added, whoever is
+    paired with it sits the round out.
+
+    :param player_count: The number of players.
+    :return: A list of rounds, each a list of (white, black) seeding
+        positions in board order.
+    """
+    count = player_count + player_count % 2
+    fixed = count - 1
+    schedule = []
+    for round_index in range(count - 1):
+        first = round_index * (count // 2) % (count - 1)
+        rotation = [(first + step) % (count - 1) for step in range(count - 1)]
+        if round_index % 2:
+            pairs = [(fixed, rotation[0])]
+        else:
+            pairs = [(rotation[0], fixed)]
+        pairs += [
+            (rotation[board], rotation[count - 1 - board])
+            for board in range(1, count // 2)
+        ]
+        schedule.append([
+            pair for pair in pairs
+            if pair[0] < player_count and pair[1] < player_count
+        ])
+    return schedule
+
+
+PAIRING_SYSTEMS = {
+    "weighted": pair_players,
+    "dutch": pair_players_dutch,
+    "parallel": pair_players_parallel,
+}
+ROUND_ROBIN = "round_robin"
+PAIRING_SYSTEM_NAMES = (*PAIRING_SYSTEMS, ROUND_ROBIN)
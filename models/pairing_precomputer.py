@@ -0,0 +1,250 @@
+import itertools
+import threading
+
+from .match import Match
+from .player import Player
+from .ratings import update_round_ratings
+from .round import Round
+
+# the number of matches without result up to which the next round is paired
+# for every combination of their results, 3 ** SPECULATION_DEPTH pairings
+SPECULATION_DEPTH = 2
+OUTCOMES = ((1, 0), (0.5, 0.5), (0, 1))
+# the parallel search already uses every core until its deadline
+UNSUPPORTED_PAIRING_SYSTEMS = ("parallel",)
+
+
+class PairingPrecomputer:
+    def __init__(self, tournament, depth=SPECULATION_DEPTH):
+        """
+        Initialize a PairingPrecomputer instance.
+
+        While the results of the current round are entered, the next round
+        is paired speculatively in a background thread. Once at most depth
+        matches are left without a result, the next round is paired for
+        every combination of their possible results. Each new result only
+        discards the candidates it rules out, nothing is paired again, so
+        when the arbiter creates the next round its pairing is already
+        available, or at least already started.
+
+        Candidates are paired on copies of the players carrying the scores of
+        their combination of results, and the ratings they will have once
+        the round is rated, as Controller.db_update_ratings does before the
+        next round is created. The tournament itself is only read.
+
+        :param tournament: The Tournament instance whose next round is paired.
+        :param depth: The number of matches without result from which the
+            candidates are paired.
+        """
+        self.tournament = tournament
+        self.depth = depth
+        self.condition = threading.Condition()
+        self.matches = []
+        self.base_scores = {}
+        self.base_ratings = {}
+        self.needed = []
+        self.candidates = {}
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def supports(tournament):
+        """
+        Check whether the next round of a tournament can be precomputed.
+
+        :param tournament: The Tournament instance.
+        :return: True if the pairing of the tournament can be precomputed.
+        """
+        return (
+            not tournament.is_round_robin()
+            and tournament.pairing_system not in UNSUPPORTED_PAIRING_SYSTEMS
+        )
+
+    def start(self):
+        """
+        Start pairing the next round in the background, for the results of
+        the current round.
+        """
+        for player in self.tournament.players:
+            self.tournament.intern_player(player.national_chess_id)
+        self.tournament.ensure_match_history()
+
+        self.matches = list(self.tournament.rounds[-1].matches)
+        # the scores before the results of the current round
+        self.base_scores = {
+            player.national_chess_id: player.score
+            for player in self.tournament.players
+        }
+        for match, (score_1, score_2) in zip(self.matches, self._results()):
+            self._add_score(self.base_scores, match.player_1, -score_1)
+            self._add_score(self.base_scores, match.player_2, -score_2)
+        # the ratings before the round is rated, including players who left
+        # the tournament after playing this round
+        self.base_ratings = {
+            player.national_chess_id: player.rating
+            for player in self.tournament.players
+        }
+        for match in self.matches:
+            for player in (match.player_1, match.player_2):
+                self.base_ratings[player.national_chess_id] = player.rating
+
+        with self.condition:
+            self._update_needed()
+        self.thread.start()
+
+    def result_entered(self):
+        """
+        Signal that a match result was entered, discarding the candidates it
+        rules out.
+        """
+        with self.condition:
+            self._update_needed()
+            self.condition.notify_all()
+
+    def take(self):
+        """
+        Wait for the pairing of the final results of the round and stop the
+        background thread.
+
+        :return: A (ranked players, pairs, bye) tuple for
+            Tournament.create_round, or None if a result is missing or the
+            pairing failed.
+        """
+        with self.condition:
+            self._update_needed()
+            key = tuple(self._results())
+            if self.needed != [key]:
+                result = None
+            else:
+                while key not in self.candidates:
+                    self.condition.wait()
+                result = self.candidates[key]
+        self.stop()
+        return result
+
+    def stop(self):
+        """
+        Stop the background thread, e.g. when the round is cancelled.
+        """
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def _results(self):
+        """
+        Return the current result of each match of the round.
+
+        :return: A list of (player 1 match score, player 2 match score).
+        """
+        return [
+            (match.player_1_match_score, match.player_2_match_score)
+            for match in self.matches
+        ]
+
+    @staticmethod
+    def _add_score(scores, player, score):
+        """
+        Add points to a player in a dictionary of scores, if they are still
+        part of the tournament.
+        """
+        if player.national_chess_id in scores:
+            scores[player.national_chess_id] += score
+
+    def _update_needed(self):
+        """
+        List the combinations of results to pair: every combination of the
+        results of the matches without result, once there are at most depth
+        of them. Candidates of other combinations are discarded. Called with
+        the condition held.
+        """
+        results = self._results()
+        pending = [
+            position for position, (score_1, score_2) in enumerate(results)
+            if score_1 + score_2 == 0
+        ]
+        self.needed = []
+        if len(pending) <= self.depth:
+            for outcomes in itertools.product(OUTCOMES, repeat=len(pending)):
+                for position, outcome in zip(pending, outcomes):
+                    results[position] = outcome
+                self.needed.append(tuple(results))
+        self.candidates = {
+            key: candidate for key, candidate in self.candidates.items()
+            if key in self.needed
+        }
+
+    def _pair(self, key):
+        """
+        Pair the next round as if the round ended with the given results.
+
+        :param key: The result of each match of the round.
+        :return: A (ranked players, pairs, bye) tuple of the tournament
+            players.
+        """
+        scores = dict(self.base_scores)
+        for match, (score_1, score_2) in zip(self.matches, key):
+            self._add_score(scores, match.player_1, score_1)
+            self._add_score(scores, match.player_2, score_2)
+        players = {
+            player.national_chess_id: player
+            for player in self.tournament.players
+        }
+        copies = {
+            national_chess_id: Player(
+                "", "", "", national_chess_id,
+                scores.get(national_chess_id, 0.0), rating
+            )
+            for national_chess_id, rating in self.base_ratings.items()
+        }
+        update_round_ratings(Round("", [
+            Match(
+                copies[match.player_1.national_chess_id],
+                copies[match.player_2.national_chess_id],
+                score_1, score_2
+            )
+            for match, (score_1, score_2) in zip(self.matches, key)
+        ]))
+        ranked = self.tournament.ranked_players_for_round([
+            copies[national_chess_id] for national_chess_id in players
+        ])
+        pairs, bye = self.tournament.generate_pairs(
+            ranked, self.tournament.played
+        )
+        return (
+            [players[player.national_chess_id] for player in ranked],
+            [
+                (
+                    players[player_1.national_chess_id],
+                    players[player_2.national_chess_id]
+                )
+                for player_1, player_2 in pairs
+            ],
+            players[bye.national_chess_id] if bye else None
+        )
+
+    def _run(self):
+        """
+        Pair the needed combinations of results one at a time, until
+        stopped.
+        """
+        while True:
+            with self.condition:
+                while not self.stopped and all(
+                    key in self.candidates for key in self.needed
+                ):
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                key = next(
+                    key for key in self.needed if key not in self.candidates
+                )
+
+            try:
+                candidate = self._pair(key)
+            except Exception:
+                candidate = None
+
+            with self.condition:
+                if key in self.needed:
+                    self.candidates[key] = candidate
+                self.condition.notify_all()
@@ -1,16 +1,20 @@
-from tinydb import TinyDB, Query
-
-db = TinyDB("data/db.json")
+from .ratings import DEFAULT_RATING
 
 
 class Player:
+    __slots__ = (
+        "name", "surname", "birthday", "national_chess_id", "score",
+        "rating"
+    )
+
     def __init__(
             self,
             name: str,
             surname: str,
             birthday: str,
             national_chess_id: str,
-            score=0.0
+            score=0.0,
+            rating=DEFAULT_RATING
     ):
         """
         Initialize a Player instance.
@@ -20,16 +24,55 @@ class Player:
         :param birthday: The player's date of birth.
         :param national_chess_id: The player's national chess ID.
         :param score: The player's score in the tournament.
+        :param rating: The player's Elo rating.
         """
         self.name = name
         self.surname = surname
         self.birthday = birthday
         self.national_chess_id = national_chess_id
         self.score = score
+        self.rating = rating
+
+    @classmethod
+    def from_dict(cls, player_data):
+        """
+        Create a player from a serialized player, either a registry record
+        or a tournament player with its score.
+
+        The slots are set directly, without going through __init__ and
+        keyword unpacking.
+
+        :param player_data: The serialized player.
+        :return: The Player instance.
+        """
+        player = cls.__new__(cls)
+        player.name = player_data["name"]
+        player.surname = player_data["surname"]
+        player.birthday = player_data["birthday"]
+        player.national_chess_id = player_data["national_chess_id"]
+        player.score = player_data.get("score", 0.0)
+        player.rating = player_data.get("rating", DEFAULT_RATING)
+        return player
+
+    def to_dict(self):
+        """
+        Serialize the player and its score in a tournament to a dictionary.
+        The rating is kept in the player registry only.
+
+        :return: A dictionary representation of the tournament player.
+        """
+        return {
+            "name": self.name,
+            "surname": self.surname,
+            "birthday": self.birthday,
+            "national_chess_id": self.national_chess_id,
+            "score": self.score
+        }
 
     def serialize(self):
         """
-        Serialize the player data to a dictionary.
+        Serialize the player data to a dictionary, as stored in the player
+        registry.
 
         :return: A dictionary representation of the player.
         """
@@ -38,14 +81,18 @@ class Player:
             "surname": self.surname,
             "birthday": self.birthday,
             "national_chess_id": self.national_chess_id,
+            "rating": self.rating,
         }
 
-    def db_save_player(self):
+    def db_save_player(self, database):
         """
         Save or update the player in the database in the "players" table.
+        If the national chess ID is already registered, the stored rating is
+        kept, since it results from the games of the player.
+
+        :param database: The Database instance to save the player to.
         """
-        players_table = db.table("players")
-        players_table.upsert(
-            self.serialize(),
-            Query().national_chess_id == self.national_chess_id
-        )
+        player_data = database.players_index.get(self.national_chess_id)
+        if player_data is not None:
+            self.rating = player_data["rating"]
+        database.players_index.upsert(self.serialize())
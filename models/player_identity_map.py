@@ -0,0 +1,79 @@
+from .player import Player
+
+
+class PlayerIdentityMap:
+    def __init__(self, lookup=None):
+        """
+        Initialize a PlayerIdentityMap instance.
+
+        The identity map holds exactly one Player instance per national chess
+        ID for a tournament, so the tournament players, the matches and the
+        byes all share the same objects and a result updates the score of
+        the player listed in the tournament.
+
+        :param lookup: An optional callable returning the serialized player
+            of a national chess ID, or None, used to resolve players that
+            are not part of the tournament anymore (e.g. PlayersIndex.get).
+        """
+        self.lookup = lookup
+        self.players = {}
+
+    def __contains__(self, national_chess_id):
+        """
+        Check whether a player with the given national chess ID is mapped.
+
+        :param national_chess_id: The national chess ID.
+        :return: True if the player is mapped, False otherwise.
+        """
+        return national_chess_id in self.players
+
+    def __len__(self):
+        """
+        Return the number of mapped players.
+
+        :return: The number of players.
+        """
+        return len(self.players)
+
+    def add(self, player):
+        """
+        Map a player, unless a player with the same national chess ID is
+        already mapped.
+
+        :param player: A Player instance or a serialized player.
+        :return: The mapped Player instance.
+        """
+        national_chess_id = (
+            player["national_chess_id"] if isinstance(player, dict)
+            else player.national_chess_id
+        )
+        mapped = self.players.get(national_chess_id)
+        if mapped is None:
+            mapped = (
+                Player.from_dict(player) if isinstance(player, dict)
+                else player
+            )
+            self.players[national_chess_id] = mapped
+        return mapped
+
+    def get(self, national_chess_id):
+        """
+        Resolve a national chess ID to its Player instance.
+
+        Players that are not mapped yet are looked up with the lookup
+        callable, or created as an unknown player, and mapped.
+
+        :param national_chess_id: The national chess ID to resolve.
+        :return: The Player instance.
+        """
+        player = self.players.get(national_chess_id)
+        if player is None:
+            player_data = (
+                self.lookup(national_chess_id) if self.lookup else None
+            )
+            player = (
+                Player.from_dict(player_data) if player_data
+                else Player("Unknown", "player", "", national_chess_id)
+            )
+            self.players[national_chess_id] = player
+        return player
@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+import re
+import time
+
+PLAYER_FIELDS = ("name", "surname", "birthday", "national_chess_id")
+WHITESPACE = re.compile(r"\s*")
+
+
+def read_csv_rows(path):
+    """
+    Stream the rows of a CSV licensee file with a header line.
+
+    :param path: The path of the CSV file.
+    :return: A generator of row dictionaries.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        yield from csv.DictReader(handle)
+
+
+def read_ndjson_rows(path):
+    """
+    Stream the rows of a newline-delimited JSON licensee file.
+
+    :param path: The path of the NDJSON file.
+    :return: A generator of row dictionaries, None for unreadable lines.
+    """
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+def read_json_array_rows(path, chunk_size=65536, max_row_size=1 << 20):
+    """
+    Stream the rows of a JSON licensee file holding one array of objects,
+    decoding one object at a time instead of loading the whole file.
+
+    The elements must be separated by exactly one comma. A row that cannot
+    be decoded once max_row_size characters are buffered, or at the end of
+    the file, aborts the import with its position in the file.
+
+    :param path: The path of the JSON file.
+    :param chunk_size: The number of characters read at once.
+    :param max_row_size: The number of characters a row may span.
+    :return: A generator of row dictionaries.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8-sig") as handle:
+        buffer = handle.read(chunk_size)
+        # the position of the start of the buffer in the file
+        offset = 0
+        position = 0
+        # what comes next: "array", "first" row or "]", "row", or "separator"
+        expected = "array"
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()
+            if position == len(buffer):
+                chunk = handle.read(chunk_size)
+                if not chunk:
+                    raise ValueError(
+                        f"The JSON file is truncated at character "
+                        f"{offset + position}."
+                    )
+                offset += position
+                buffer = chunk
+                position = 0
+                continue
+
+            character = buffer[position]
+            if expected == "array":
+                if character != "[":
+                    raise ValueError(
+                        "The JSON file must hold an array of players."
+                    )
+                position += 1
+                expected = "first"
+            elif expected == "separator":
+                if character == "]":
+                    return
+                if character != ",":
+                    raise ValueError(
+                        f"Invalid JSON at character {offset + position}: "
+                        f"expecting ',' or ']'."
+                    )
+                position += 1
+                expected = "row"
+            elif expected == "first" and character == "]":
+                return
+            else:
+                try:
+                    row, position = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as error:
+                    chunk = (
+                        handle.read(chunk_size)
+                        if len(buffer) - position < max_row_size
+                        else ""
+                    )
+                    if not chunk:
+                        raise ValueError(
+                            f"Invalid JSON at character "
+                            f"{offset + error.pos}: {error.msg}."
+                        )
+                    offset += position
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                yield row
+                expected = "separator"
+
+
+READERS = {
+    ".csv": read_csv_rows,
+    ".ndjson": read_ndjson_rows,
+    ".jsonl": read_ndjson_rows,
+    ".json": read_json_array_rows,
+}
+
+
+def read_player_rows(path):
+    """
+    Stream the rows of a licensee file, choosing the reader from the file
+    extension (.csv, .ndjson, .jsonl or .json).
+
+    :param path: The path of the licensee file.
+    :return: A generator of row dictionaries.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(
+            f"Unsupported file type '{extension}', "
+            f"expected one of {', '.join(READERS)}."
+        )
+    return READERS[extension](path)
+
+
+def validate_player_row(row):
+    """
+    Validate a licensee row and keep only the player fields.
+
+    :param row: The row dictionary.
+    :return: The serialized player, or None if a field is missing or empty.
+    """
+    if not isinstance(row, dict):
+        return None
+
+    player_data = {}
+    for field in PLAYER_FIELDS:
+        value = row.get(field)
+        if value is None:
+            return None
+        value = str(value).strip()
+        if not value:
+            return None
+        player_data[field] = value
+    return player_data
+
+
+def import_players(database, rows, batch_size=10000, progress=None):
+    """
+    Import licensee rows in the "players" table.
+
+    Rows are validated one by one and deduplicated against the national
+    chess ID index, valid ones are inserted in batches and the whole import
+    is written in a single unit of work.
+
+    :param database: The Database instance.
+    :param rows: An iterable of row dictionaries.
+    :param batch_size: The number of players inserted at once.
+    :param progress: An optional callable receiving the number of rows read,
+        called after each batch.
+    :return: A dictionary report of the import.
+    """
+    players_index = database.players_index
+    report = {"read": 0, "imported": 0, "duplicates": 0, "invalid": 0}
+    start = time.perf_counter()
+
+    with database.unit_of_work():
+        batch = []
+        batch_ids = set()
+        for row in rows:
+            report["read"] += 1
+            player_data = validate_player_row(row)
+            if player_data is None:
+                report["invalid"] += 1
+                continue
+
+            national_chess_id = player_data["national_chess_id"]
+            if (
+                national_chess_id in batch_ids
+                or national_chess_id in players_index
+            ):
+                report["duplicates"] += 1
+                continue
+
+            batch.append(player_data)
+            batch_ids.add(national_chess_id)
+            if len(batch) >= batch_size:
+                players_index.insert_multiple(batch)
+                report["imported"] += len(batch)
+                batch = []
+                batch_ids = set()
+                if progress:
+                    progress(report["read"])
+
+        if batch:
+            players_index.insert_multiple(batch)
+            report["imported"] += len(batch)
+        if progress:
+            progress(report["read"])
+
+    report["seconds"] = time.perf_counter() - start
+    report["rows_per_second"] = (
+        report["read"] / report["seconds"] if report["seconds"] else 0
+    )
+    return report
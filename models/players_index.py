@@ -0,0 +1,239 @@
+from bisect import bisect_left, insort
+
+from tinydb.table import Document
+
+
+class PlayersIndex:
+    def __init__(self, players_table):
+        """
+        Initialize a PlayersIndex instance.
+
+        The index is an in-memory hash map of the "players" table keyed by
+        national chess ID. It is built lazily on first use and kept in sync
+        by routing every insert, update and delete through it. A sorted
+        secondary index keeps the alphabetical order (name, surname) so the
+        table never has to be rewritten just to change the display order.
+
+        :param players_table: The TinyDB "players" table to index.
+        """
+        self.players_table = players_table
+        self._documents = None
+        self._sorted_keys = None
+
+    @staticmethod
+    def _sort_key(player_data):
+        """
+        Build the alphabetical sort key of a player.
+
+        :param player_data: The serialized player.
+        :return: A tuple (name, surname, national chess ID), case-insensitive.
+        """
+        return (
+            player_data["name"].lower(),
+            player_data["surname"].lower(),
+            player_data["national_chess_id"]
+        )
+
+    def _get_documents(self):
+        """
+        Return the index, building it from the table on first use.
+
+        :return: A dictionary of player documents keyed by national chess ID.
+        """
+        if self._documents is None:
+            self._documents = {
+                document["national_chess_id"]: document
+                for document in self.players_table.all()
+            }
+            self._sorted_keys = sorted(
+                self._sort_key(document)
+                for document in self._documents.values()
+            )
+        return self._documents
+
+    def _add_sort_key(self, player_data):
+        """
+        Insert a player in the sorted secondary index.
+
+        :param player_data: The serialized player.
+        """
+        insort(self._sorted_keys, self._sort_key(player_data))
+
+    def _remove_sort_key(self, player_data):
+        """
+        Remove a player from the sorted secondary index.
+
+        :param player_data: The serialized player.
+        """
+        sort_key = self._sort_key(player_data)
+        position = bisect_left(self._sorted_keys, sort_key)
+        if (
+            position < len(self._sorted_keys)
+            and self._sorted_keys[position] == sort_key
+        ):
+            del self._sorted_keys[position]
+
+    def reset(self):
+        """
+        Drop the index so it is rebuilt from the table on next use.
+        """
+        self._documents = None
+        self._sorted_keys = None
+
+    def __contains__(self, national_chess_id):
+        """
+        Check whether a player with the given national chess ID exists.
+
+        :param national_chess_id: The national chess ID to look up.
+        :return: True if the player exists, False otherwise.
+        """
+        return national_chess_id in self._get_documents()
+
+    def __len__(self):
+        """
+        Return the number of indexed players.
+
+        :return: The number of players in the table.
+        """
+        return len(self._get_documents())
+
+    def get(self, national_chess_id):
+        """
+        Get a player document by national chess ID.
+
+        :param national_chess_id: The national chess ID to look up.
+        :return: The player document or None if not found.
+        """
+        return self._get_documents().get(national_chess_id)
+
+    def all(self):
+        """
+        Return all indexed player documents.
+
+        :return: A list of player documents.
+        """
+        return list(self._get_documents().values())
+
+    def sorted_all(self):
+        """
+        Return all indexed player documents sorted alphabetically by name
+        and surname.
+
+        :return: A sorted list of player documents.
+        """
+        documents = self._get_documents()
+        return [
+            documents[sort_key[2]] for sort_key in self._sorted_keys
+        ]
+
+    def insert(self, player_data):
+        """
+        Insert a new player in the table and in the index.
+
+        :param player_data: The serialized player.
+        :return: The document ID of the inserted player.
+        """
+        documents = self._get_documents()
+        doc_id = self.players_table.insert(player_data)
+        documents[player_data["national_chess_id"]] = Document(
+            dict(player_data), doc_id
+        )
+        self._add_sort_key(player_data)
+        return doc_id
+
+    def insert_multiple(self, players_data):
+        """
+        Insert a batch of new players in one table update, merging them in
+        the sorted secondary index with a single sort.
+
+        :param players_data: A list of serialized players.
+        :return: The document IDs of the inserted players.
+        """
+        documents = self._get_documents()
+        doc_ids = self.players_table.insert_multiple(players_data)
+        for player_data, doc_id in zip(players_data, doc_ids):
+            documents[player_data["national_chess_id"]] = Document(
+                dict(player_data), doc_id
+            )
+        self._sorted_keys.extend(
+            self._sort_key(player_data) for player_data in players_data
+        )
+        self._sorted_keys.sort()
+        return doc_ids
+
+    def update(self, national_chess_id, player_data):
+        """
+        Update an existing player, re-keying the index if the national chess
+        ID changed.
+
+        :param national_chess_id: The current national chess ID of the player.
+        :param player_data: The new serialized player.
+        :return: The document ID of the updated player or None if not found.
+        """
+        documents = self._get_documents()
+        document = documents.get(national_chess_id)
+        if document is None:
+            return None
+
+        self.players_table.update(player_data, doc_ids=[document.doc_id])
+        self._remove_sort_key(document)
+        document.update(player_data)
+        self._add_sort_key(document)
+
+        if document["national_chess_id"] != national_chess_id:
+            del documents[national_chess_id]
+            documents[document["national_chess_id"]] = document
+        return document.doc_id
+
+    def update_ratings(self, ratings):
+        """
+        Update the rating of many players in one table update. Unknown
+        national chess IDs are ignored.
+
+        :param ratings: A dictionary of ratings keyed by national chess ID.
+        :return: The number of updated players.
+        """
+        documents = self._get_documents()
+        doc_ids = [
+            documents[national_chess_id].doc_id
+            for national_chess_id in ratings
+            if national_chess_id in documents
+        ]
+        if not doc_ids:
+            return 0
+
+        def set_rating(document):
+            document["rating"] = ratings[document["national_chess_id"]]
+
+        self.players_table.update(set_rating, doc_ids=doc_ids)
+        for national_chess_id, rating in ratings.items():
+            if national_chess_id in documents:
+                documents[national_chess_id]["rating"] = rating
+        return len(doc_ids)
+
+    def upsert(self, player_data):
+        """
+        Update the player if its national chess ID is known, insert it
+        otherwise.
+
+        :param player_data: The serialized player.
+        :return: The document ID of the player.
+        """
+        national_chess_id = player_data["national_chess_id"]
+        if national_chess_id in self._get_documents():
+            return self.update(national_chess_id, player_data)
+        return self.insert(player_data)
+
+    def remove(self, national_chess_id):
+        """
+        Remove a player from the table and from the index.
+
+        :param national_chess_id: The national chess ID of the player.
+        :return: True if the player was removed, False if not found.
+        """
+        document = self._get_documents().pop(national_chess_id, None)
+        if document is None:
+            return False
+        self._remove_sort_key(document)
+        self.players_table.remove(doc_ids=[document.doc_id])
+        return True
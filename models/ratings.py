@@ -0,0 +1,296 @@
+import numpy as np
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 20
+
+
+def expected_scores(ratings_1, ratings_2):
+    """
+    Compute the Elo expected score of the first player of each game.
+
+    :param ratings_1: The ratings of the first players.
+    :param ratings_2: The ratings of the second players.
+    :return: An array of expected scores, between 0 and 1.
+    """
+    return 1.0 / (1.0 + 10.0 ** ((ratings_2 - ratings_1) / 400.0))
+
+
+def rating_changes(
+        ratings, rows_1, rows_2, scores_1, scores_2, k_factor=K_FACTOR
+):
+    """
+    Compute the rating change of every player over one rating period.
+
+    The expected scores of every game of the period are computed from the
+    ratings at the start of the period, and the changes of each player are
+    summed, so the whole period is one batch of array operations whatever
+    the number of games.
+
+    :param ratings: The ratings at the start of the period, one per row.
+    :param rows_1: The rows of the first players of the games.
+    :param rows_2: The rows of the second players of the games.
+    :param scores_1: The points scored by the first players.
+    :param scores_2: The points scored by the second players.
+    :param k_factor: The development coefficient.
+    :return: An array of rating changes, one per row.
+    """
+    expected_1 = expected_scores(ratings[rows_1], ratings[rows_2])
+    changes = np.bincount(
+        rows_1, k_factor * (scores_1 - expected_1), minlength=len(ratings)
+    )
+    changes += np.bincount(
+        rows_2, k_factor * (scores_2 - (1.0 - expected_1)),
+        minlength=len(ratings)
+    )
+    return changes
+
+
+def update_round_ratings(round_instance, k_factor=K_FACTOR):
+    """
+    Update the ratings of the players of a finished round in one batch, the
+    round being the rating period. A bye is not a game and does not change
+    the rating of its player.
+
+    :param round_instance: The Round instance.
+    :param k_factor: The development coefficient.
+    :return: The list of players whose rating was updated.
+    """
+    rows = {}
+    players = []
+    for match in round_instance.matches:
+        for player in (match.player_1, match.player_2):
+            if player.national_chess_id not in rows:
+                rows[player.national_chess_id] = len(players)
+                players.append(player)
+    if not players:
+        return []
+
+    games = np.array([
+        (
+            rows[match.player_1.national_chess_id],
+            rows[match.player_2.national_chess_id],
+            match.player_1_match_score,
+            match.player_2_match_score
+        )
+        for match in round_instance.matches
+    ])
+    ratings = np.array([player.rating for player in players], dtype=float)
+    ratings += rating_changes(
+        ratings, games[:, 0].astype(np.int64), games[:, 1].astype(np.int64),
+        games[:, 2], games[:, 3], k_factor
+    )
+    for player, rating in zip(players, ratings.tolist()):
+        player.rating = rating
+    return players
+
+
+def replay(
+        player_count, periods, rows_1, rows_2, scores_1, scores_2,
+        k_factor=K_FACTOR
+):
+    """
+    Compute the ratings of every player from scratch, applying the rating
+    periods in order, each as one batch. A player plays at most one game per
+    period, like in a round, so each period only updates the rows of its
+    players.
+
+    :param player_count: The number of rows.
+    :param periods: The rating period of each game, sorted.
+    :param rows_1: The rows of the first players of the games.
+    :param rows_2: The rows of the second players of the games.
+    :param scores_1: The points scored by the first players.
+    :param scores_2: The points scored by the second players.
+    :param k_factor: The development coefficient.
+    :return: An array of ratings, one per row.
+    """
+    ratings = np.full(player_count, DEFAULT_RATING)
+    boundaries = np.flatnonzero(np.diff(periods)) + 1
+    for start, end in zip(
+        np.r_[0, boundaries].tolist(),
+        np.r_[boundaries, len(periods)].tolist()
+    ):
+        period_rows_1 = rows_1[start:end]
+        period_rows_2 = rows_2[start:end]
+        expected_1 = expected_scores(
+            ratings[period_rows_1], ratings[period_rows_2]
+        )
+        ratings[period_rows_1] += k_factor * (scores_1[start:end] - expected_1)
+        ratings[period_rows_2] += k_factor * (
+            scores_2[start:end] - (1.0 - expected_1)
+        )
+    return ratings
+
+
+def extract_games(tournament_data):
+    """
+    Extract the games of the finished rounds of a serialized tournament as
+    arrays, the form in which they are cached for the rating recompute.
+
+    :param tournament_data: The serialized tournament.
+    :return: A tuple (national_chess_ids, end_dates, games) of arrays: the
+        national chess IDs of the players who played, the end dates of the
+        finished rounds with games and one row per game (round index, index
+        of player 1, index of player 2, score of player 1, score of player
+        2), the indices referring to the first two arrays.
+    """
+    rounds = [
+        round_data for round_data in tournament_data.get("rounds", [])
+        if round_data.get("end_date") and round_data["matches"]
+    ]
+    indices = {}
+    games = [
+        (
+            round_index,
+            indices.setdefault(match[0], len(indices)),
+            indices.setdefault(match[2], len(indices)),
+            match[1],
+            match[3]
+        )
+        for round_index, round_data in enumerate(rounds)
+        for match in round_data["matches"]
+    ]
+    return (
+        np.array(list(indices), dtype=str),
+        np.array(
+            [round_data["end_date"] for round_data in rounds],
+            dtype="datetime64[us]"
+        ),
+        np.array(games, dtype=float).reshape(-1, 5)
+    )
+
+
+def number_strings(strings):
+    """
+    Number the distinct strings of an array without creating a Python object
+    per string. The code points of the characters are packed in 64-bit keys,
+    as many characters at a time as fit next to the numbers given to the
+    previous characters, and the keys are numbered by sorting them.
+
+    :param strings: An array of strings.
+    :return: A tuple (distinct strings, number of each string), the distinct
+        strings being sorted.
+    """
+    strings = np.ascontiguousarray(strings)
+    codes = strings.view(np.uint32).reshape(
+        len(strings), strings.dtype.itemsize // 4
+    )
+    code_bits = max(int(codes.max(initial=0)).bit_length(), 1)
+    numbers = np.zeros(len(strings), dtype=np.uint64)
+    number_bits = 0
+    column = 0
+    while True:
+        count = (64 - number_bits) // code_bits
+        keys = numbers.astype(np.uint64)
+        for code_column in codes[:, column:column + count].T:
+            keys = (keys << np.uint64(code_bits)) | code_column
+        distinct_keys, numbers = np.unique(keys, return_inverse=True)
+        number_bits = len(distinct_keys).bit_length()
+        column += count
+        if column >= codes.shape[1]:
+            break
+
+    first = np.empty(len(distinct_keys), dtype=np.int64)
+    first[numbers] = np.arange(len(strings))
+    return strings[first], numbers
+
+
+def collect_games(tournaments_games):
+    """
+    Collect the games of the stored tournaments, ordered by rating period.
+    Like the live update, each round is one rating period. Rounds without a
+    common player do not change each other's ratings, so each round gets the
+    period following the previous rounds of its players, in the order the
+    rounds ended, and the rounds of the same period are replayed as one
+    batch.
+
+    :param tournaments_games: An iterable of the games of each tournament,
+        as returned by extract_games.
+    :return: A tuple (rows, periods, rows_1, rows_2, scores_1, scores_2)
+        where rows maps each national chess ID to its row.
+    """
+    tournaments_games = list(tournaments_games)
+    id_counts, round_counts, game_counts = (
+        np.array(
+            [len(arrays[column]) for arrays in tournaments_games],
+            dtype=np.int64
+        )
+        for column in range(3)
+    )
+    national_chess_ids, id_rows = number_strings(np.concatenate(
+        [national_chess_ids for national_chess_ids, _, _ in tournaments_games]
+        + [np.empty(0, dtype=str)]
+    ))
+    rows = dict(
+        zip(national_chess_ids.tolist(), range(len(national_chess_ids)))
+    )
+    end_dates = np.concatenate(
+        [end_dates for _, end_dates, _ in tournaments_games]
+        + [np.empty(0, dtype="datetime64[us]")]
+    )
+    games = np.concatenate(
+        [games for _, _, games in tournaments_games] + [np.empty((0, 5))]
+    )
+    del tournaments_games
+
+    # the games of a round are contiguous, in the order of the rounds
+    round_ids = games[:, 0].astype(np.int64) + np.repeat(
+        np.cumsum(round_counts) - round_counts, game_counts
+    )
+    id_offsets = np.repeat(np.cumsum(id_counts) - id_counts, game_counts)
+    rows_1 = id_rows[games[:, 1].astype(np.int64) + id_offsets]
+    rows_2 = id_rows[games[:, 2].astype(np.int64) + id_offsets]
+    round_sizes = np.bincount(round_ids, minlength=len(end_dates))
+    round_starts = np.cumsum(round_sizes) - round_sizes
+
+    players = np.stack((rows_1, rows_2), axis=1).ravel()
+    last_periods = np.full(len(rows), -1)
+    round_periods = np.empty(len(end_dates), dtype=np.int64)
+    order = np.argsort(end_dates, kind="stable")
+    for round_id, start, end in zip(
+        order.tolist(),
+        (2 * round_starts[order]).tolist(),
+        (2 * (round_starts + round_sizes)[order]).tolist()
+    ):
+        round_players = players[start:end]
+        period = last_periods.take(round_players).max() + 1
+        last_periods[round_players] = period
+        round_periods[round_id] = period
+    del players, last_periods
+
+    order = np.argsort(round_periods, kind="stable")
+    sizes = round_sizes[order]
+    periods = np.repeat(round_periods[order], sizes)
+    game_order = np.arange(len(games)) + np.repeat(
+        round_starts[order] - (np.cumsum(sizes) - sizes), sizes
+    )
+    return (
+        rows, periods, rows_1[game_order], rows_2[game_order],
+        games[game_order, 3], games[game_order, 4]
+    )
+
+
+def recompute_ratings(database, k_factor=K_FACTOR):
+    """
+    Recompute the rating of every registered player by replaying the games
+    of every stored tournament, and store them in the "players" table.
+    Players without games get the default rating.
+
+    :param database: The Database instance.
+    :param k_factor: The development coefficient.
+    :return: A tuple (number of games, number of rated players).
+    """
+    rows, periods, rows_1, rows_2, scores_1, scores_2 = collect_games(
+        games for _, games in database.all_tournament_games()
+    )
+    ratings = replay(
+        len(rows), periods, rows_1, rows_2, scores_1, scores_2, k_factor
+    ).tolist()
+    database.players_index.update_ratings({
+        player_data["national_chess_id"]: (
+            ratings[rows[player_data["national_chess_id"]]]
+            if player_data["national_chess_id"] in rows
+            else DEFAULT_RATING
+        )
+        for player_data in database.players_index.all()
+    })
+    return len(periods), len(rows)
@@ -1,13 +1,22 @@
+from .match import Match
+
 from datetime import datetime
 
 
 class Round:
+    __slots__ = (
+        "round_name", "matches", "start_date", "end_date", "bye",
+        "bye_score", "_serialized"
+    )
+
     def __init__(
             self,
             round_name: str,
             matches=None,
             start_date=None,
-            end_date=None
+            end_date=None,
+            bye=None,
+            bye_score=0
     ):
         """
         Initialize a Round instance.
@@ -16,39 +25,106 @@ class Round:
         :param matches: A list of matches in the round.
         :param start_date: The start date of the round.
         :param end_date: The end date of the round.
+        :param bye: The player left without an opponent, or None.
+        :param bye_score: The score given to the bye player.
         """
         self.round_name = round_name
         self.matches = matches if matches else []
         self.start_date = start_date
         self.end_date = end_date
+        self.bye = bye
+        self.bye_score = bye_score
+        self._serialized = None
 
-    def serialize(self):
+    @classmethod
+    def from_dict(cls, round_data, identity_map):
+        """
+        Create a round, with its matches, from a serialized round.
+
+        The loaded data is kept as the up-to-date serialized form of the
+        round, so saving an untouched round does not serialize it again.
+
+        :param round_data: The serialized round.
+        :param identity_map: The PlayerIdentityMap of the tournament.
+        :return: The Round instance.
+        """
+        match_from_dict = Match.from_dict
+        start_date = round_data.get("start_date")
+        end_date = round_data.get("end_date")
+        bye_data = round_data.get("bye")
+
+        round_instance = cls.__new__(cls)
+        round_instance.round_name = round_data["round_name"]
+        round_instance.matches = [
+            match_from_dict(match_data, identity_map)
+            for match_data in round_data["matches"]
+        ]
+        round_instance.start_date = (
+            datetime.fromisoformat(start_date) if start_date else None
+        )
+        round_instance.end_date = (
+            datetime.fromisoformat(end_date) if end_date else None
+        )
+        round_instance.bye = (
+            identity_map.get(bye_data["player"]) if bye_data else None
+        )
+        round_instance.bye_score = bye_data["score"] if bye_data else 0
+        round_instance._serialized = round_data
+        return round_instance
+
+    def to_dict(self):
         """
         Serialize the round data to a dictionary.
 
+        The result is cached until the round or one of its matches changes,
+        so untouched rounds are not serialized again on every save.
+
         :return: A dictionary representation of the round.
         """
-        return {
-            "round_name": self.round_name,
-            "matches": [
-                match.serialize() for match in self.matches
-            ],
-            "start_date": (
-                self.start_date.isoformat() if self.start_date else None
-            ),
-            "end_date": (
-                self.end_date.isoformat() if self.end_date else None
-            )
-        }
+        if self.is_dirty():
+            self._serialized = {
+                "round_name": self.round_name,
+                "matches": [
+                    match.to_dict() for match in self.matches
+                ],
+                "start_date": (
+                    self.start_date.isoformat() if self.start_date else None
+                ),
+                "end_date": (
+                    self.end_date.isoformat() if self.end_date else None
+                ),
+                "bye": (
+                    {
+                        "player": self.bye.national_chess_id,
+                        "score": self.bye_score
+                    }
+                    if self.bye
+                    else None
+                )
+            }
+        return self._serialized
+
+    def is_dirty(self):
+        """
+        Check whether the round or one of its matches changed since it was
+        last serialized.
+
+        :return: True if the round has no up-to-date serialized form.
+        """
+        return self._serialized is None or any(
+            match.is_dirty() for match in self.matches
+        )
 
     def start_round(self):
         """
         Set the start date of the round to the current date and time.
         """
         self.start_date = datetime.now()
+        self._serialized = None
 
     def end_round(self):
         """
         Set the end date of the round to the current date and time.
         """
         self.end_date = datetime.now()
+        self._serialized = None
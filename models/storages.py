@@ -0,0 +1,321 @@
+import copy
+import json
+import math
+import os
+
+import numpy as np
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage
+
+
+def write_atomically(path, dump, binary=False, encoding=None):
+    """
+    Write a file through a temporary file in the same directory which then
+    replaces it, so a crash never leaves a half-written file behind.
+
+    :param path: The path of the file.
+    :param dump: A function writing the content to an open file handle.
+    :param binary: True to open the file in binary mode.
+    :param encoding: The encoding of a text file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    file_descriptor = os.open(
+        temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666
+    )
+    try:
+        with os.fdopen(
+            file_descriptor, "wb" if binary else "w", encoding=encoding
+        ) as handle:
+            dump(handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class AtomicJSONStorage(Storage):
+    def __init__(self, path, encoding=None):
+        """
+        Initialize an AtomicJSONStorage instance.
+
+        Every write goes to a temporary file in the same directory which then
+        replaces the database file, so a crash never leaves a half-written
+        database behind.
+
+        :param path: The path of the JSON database file.
+        :param encoding: The encoding of the JSON database file.
+        """
+        self.path = path
+        self.encoding = encoding
+
+    def read(self):
+        """
+        Read the whole database from the JSON file.
+
+        :return: The database content or None if the file does not exist.
+        """
+        try:
+            with open(self.path, encoding=self.encoding) as handle:
+                content = handle.read()
+        except FileNotFoundError:
+            return None
+        return json.loads(content) if content else None
+
+    def write(self, data):
+        """
+        Atomically replace the JSON file with the given database content.
+
+        :param data: The database content.
+        """
+        write_atomically(
+            self.path, lambda handle: handle.write(json.dumps(data)),
+            encoding=self.encoding
+        )
+
+
+class AtomicArrayStorage:
+    def __init__(self, path):
+        """
+        Initialize an AtomicArrayStorage instance.
+
+        The content is a tuple of NumPy arrays. The file starts with a JSON
+        line listing the type and shape of each array, followed by their raw
+        bytes, so reading it back only parses that line. Like
+        AtomicJSONStorage, every write replaces the file atomically.
+
+        :param path: The path of the array file.
+        """
+        self.path = path
+
+    def read(self):
+        """
+        Read the arrays from the file.
+
+        :return: A tuple of read-only arrays or None if the file does not
+            exist.
+        """
+        try:
+            with open(self.path, "rb") as handle:
+                content = handle.read()
+        except FileNotFoundError:
+            return None
+
+        header_end = content.index(b"\n")
+        offset = header_end + 1
+        arrays = []
+        for dtype, shape in json.loads(content[:header_end]):
+            array = np.frombuffer(
+                content, dtype=dtype, count=math.prod(shape), offset=offset
+            )
+            arrays.append(array.reshape(shape))
+            offset += array.nbytes
+        return tuple(arrays)
+
+    def write(self, data):
+        """
+        Atomically replace the file with the given arrays.
+
+        :param data: A tuple of arrays.
+        """
+        header = json.dumps(
+            [[array.dtype.str, array.shape] for array in data]
+        )
+
+        def dump(handle):
+            handle.write(f"{header}\n".encode())
+            for array in data:
+                handle.write(np.ascontiguousarray(array).tobytes())
+
+        write_atomically(self.path, dump, binary=True)
+
+
+class UnitOfWorkMiddleware(Middleware):
+    def __init__(self, storage_cls):
+        """
+        Initialize an UnitOfWorkMiddleware instance.
+
+        While a unit of work is open, writes are buffered in memory and reads
+        are served from the buffer. The buffer is flushed in a single write
+        when the outermost unit of work commits. Each unit of work keeps a
+        copy of the buffer as it was when it was opened, so a nested unit of
+        work can be rolled back alone.
+
+        :param storage_cls: The storage class to wrap.
+        """
+        super().__init__(storage_cls)
+        self.depth = 0
+        self.pending = None
+        self.savepoints = []
+
+    def read(self):
+        """
+        Read the database, from the buffer if a unit of work holds changes.
+
+        :return: The database content.
+        """
+        if self.pending is not None:
+            return self.pending
+        return self.storage.read()
+
+    def write(self, data):
+        """
+        Write the database, or buffer it while a unit of work is open.
+
+        :param data: The database content.
+        """
+        if self.depth:
+            self.pending = data
+        else:
+            self.storage.write(data)
+
+    def begin(self):
+        """
+        Open a (possibly nested) unit of work.
+        """
+        # TinyDB updates the buffer in place, the savepoint must be a copy
+        self.savepoints.append(copy.deepcopy(self.pending))
+        self.depth += 1
+
+    def commit(self):
+        """
+        Close the current unit of work, flushing the buffer if it was the
+        outermost one.
+        """
+        if self.depth:
+            self.depth -= 1
+            self.savepoints.pop()
+        if self.depth == 0 and self.pending is not None:
+            pending, self.pending = self.pending, None
+            self.storage.write(pending)
+
+    def rollback(self):
+        """
+        Close the current unit of work and restore the buffer as it was when
+        it was opened, discarding every buffered change if it was the
+        outermost one.
+        """
+        if self.depth:
+            self.depth -= 1
+            self.pending = self.savepoints.pop()
+
+
+class TournamentStore:
+    def __init__(
+            self, directory=None, storage_cls=AtomicJSONStorage,
+            extension="json"
+    ):
+        """
+        Initialize a TournamentStore instance.
+
+        Each tournament document is stored in its own JSON file named after
+        its document ID, so saving a tournament never rewrites the others.
+        Like UnitOfWorkMiddleware, writes are buffered while a unit of work
+        is open, and each unit of work can be rolled back alone.
+
+        :param directory: The directory of the tournament files, or None to
+            keep the documents in memory.
+        :param storage_cls: The storage class of the files.
+        :param extension: The extension of the file names.
+        """
+        self.directory = directory
+        self.storage_cls = storage_cls
+        self.extension = extension
+        self.documents = {}
+        self.depth = 0
+        self.pending = {}
+        self.savepoints = []
+
+    def _storage(self, doc_id):
+        """
+        Return the storage of a tournament file.
+
+        :param doc_id: The document ID of the tournament.
+        :return: The storage instance.
+        """
+        return self.storage_cls(
+            os.path.join(self.directory, f"{doc_id}.{self.extension}")
+        )
+
+    def read(self, doc_id):
+        """
+        Read a tournament document.
+
+        :param doc_id: The document ID of the tournament.
+        :return: The tournament document or None if it does not exist.
+        """
+        if doc_id in self.pending:
+            return self.pending[doc_id]
+        if self.directory is None:
+            return self.documents.get(doc_id)
+        return self._storage(doc_id).read()
+
+    def write(self, doc_id, data):
+        """
+        Write a tournament document, or buffer it while a unit of work is
+        open.
+
+        :param doc_id: The document ID of the tournament.
+        :param data: The tournament document.
+        """
+        if self.depth:
+            self.pending[doc_id] = data
+        elif self.directory is None:
+            self.documents[doc_id] = data
+        else:
+            self._storage(doc_id).write(data)
+
+    def remove(self, doc_id):
+        """
+        Remove a tournament document, or buffer the removal while a unit of
+        work is open. Removing a missing document does nothing.
+
+        :param doc_id: The document ID of the tournament.
+        """
+        if self.depth:
+            self.pending[doc_id] = None
+        elif self.directory is None:
+            self.documents.pop(doc_id, None)
+        else:
+            try:
+                os.remove(self._storage(doc_id).path)
+            except FileNotFoundError:
+                pass
+
+    def begin(self):
+        """
+        Open a (possibly nested) unit of work.
+        """
+        # documents are replaced, never updated in place: a shallow copy
+        self.savepoints.append(dict(self.pending))
+        self.depth += 1
+
+    def commit(self):
+        """
+        Close the current unit of work, writing the buffered documents if it
+        was the outermost one.
+        """
+        if self.depth:
+            self.depth -= 1
+            self.savepoints.pop()
+        if self.depth == 0:
+            pending, self.pending = self.pending, {}
+            for doc_id, data in pending.items():
+                if data is None:
+                    self.remove(doc_id)
+                else:
+                    self.write(doc_id, data)
+
+    def rollback(self):
+        """
+        Close the current unit of work and restore the buffered documents as
+        they were when it was opened, discarding them all if it was the
+        outermost one.
+        """
+        if self.depth:
+            self.depth -= 1
+            self.pending = self.savepoints.pop()
@@ -0,0 +1,151 @@
+import numpy as np
+
+TIE_BREAKS = (
+    "buchholz", "median_buchholz", "sonneborn_berger", "progressive"
+)
+
+
+def build_result_matrices(players, rounds):
+    """
+    Build the opponent-index and result matrices of a tournament, one row
+    per player and one column per round.
+
+    Players who played in the tournament but are no longer part of it get
+    rows after the current players, so their games still count for their
+    opponents.
+
+    :param players: The players of the tournament.
+    :param rounds: The rounds of the tournament.
+    :return: A tuple (all players, opponents, results, scores) where
+        opponents[i, r] is the row of the opponent of player i in round r
+        or -1 if they did not play, results[i, r] the points they scored
+        that round (byes included) and scores the score of each player.
+    """
+    all_players = list(players)
+    rows = {
+        player.national_chess_id: row for row, player in enumerate(players)
+    }
+
+    def row_of(player):
+        if player.national_chess_id not in rows:
+            rows[player.national_chess_id] = len(all_players)
+            all_players.append(player)
+        return rows[player.national_chess_id]
+
+    games = []
+    for round_number, round_instance in enumerate(rounds):
+        for match in round_instance.matches:
+            games.append((
+                round_number, row_of(match.player_1), row_of(match.player_2),
+                match.player_1_match_score, match.player_2_match_score
+            ))
+        if round_instance.bye is not None:
+            games.append((
+                round_number, row_of(round_instance.bye), -1,
+                round_instance.bye_score, 0
+            ))
+
+    opponents = np.full((len(all_players), len(rounds)), -1, dtype=np.int64)
+    results = np.zeros((len(all_players), len(rounds)))
+    if games:
+        round_numbers, rows_1, rows_2, scores_1, scores_2 = (
+            np.array(column) for column in zip(*games)
+        )
+        opponents[rows_1, round_numbers] = rows_2
+        results[rows_1, round_numbers] = scores_1
+        played = rows_2 >= 0
+        opponents[rows_2[played], round_numbers[played]] = rows_1[played]
+        results[rows_2[played], round_numbers[played]] = scores_2[played]
+
+    scores = np.array([player.score for player in all_players], dtype=float)
+    return all_players, opponents, results, scores
+
+
+def compute_tie_breaks(opponents, results, scores):
+    """
+    Compute every tie-break for every player with array operations.
+
+    - Buchholz: the sum of the scores of the opponents.
+    - Median Buchholz: the Buchholz without the best and the worst
+      opponent, for players with more than two games.
+    - Sonneborn-Berger: the sum of the scores of the opponents weighted by
+      the points scored against them.
+    - Progressive: the sum of the running scores after each round.
+
+    Byes and missed rounds have no opponent and do not count in the
+    opponent based tie-breaks.
+
+    :param opponents: The opponent-index matrix.
+    :param results: The result matrix.
+    :param scores: The score of each player.
+    :return: A dictionary of arrays, one value per player, keyed by the
+        names of TIE_BREAKS.
+    """
+    played = opponents >= 0
+    opponent_scores = np.where(played, scores[opponents], 0.0)
+    game_count = played.sum(axis=1)
+
+    buchholz = opponent_scores.sum(axis=1)
+    best = np.where(played, opponent_scores, -np.inf).max(
+        axis=1, initial=-np.inf
+    )
+    worst = np.where(played, opponent_scores, np.inf).min(
+        axis=1, initial=np.inf
+    )
+    # players without games have no best or worst opponent, np.where below
+    # computes both branches and inf - inf would warn
+    best[game_count == 0] = 0.0
+    worst[game_count == 0] = 0.0
+    median_buchholz = np.where(
+        game_count > 2, buchholz - best - worst, buchholz
+    )
+    sonneborn_berger = (np.where(played, results, 0.0) * opponent_scores).sum(
+        axis=1
+    )
+    progressive = np.cumsum(results, axis=1).sum(axis=1)
+
+    return {
+        "buchholz": buchholz,
+        "median_buchholz": median_buchholz,
+        "sonneborn_berger": sonneborn_berger,
+        "progressive": progressive,
+    }
+
+
+def compute_standings(players, rounds):
+    """
+    Rank the players of a tournament by score, then by the tie-breaks in
+    the order of TIE_BREAKS, then by national chess ID, so the standings
+    are the same every time they are computed.
+
+    :param players: The players of the tournament.
+    :param rounds: The rounds of the tournament.
+    :return: A tuple (ranked players, tie-breaks) where tie-breaks maps each
+        national chess ID to a dictionary of its tie-break values.
+    """
+    if not players:
+        return [], {}
+
+    all_players, opponents, results, scores = build_result_matrices(
+        players, rounds
+    )
+    tie_breaks = compute_tie_breaks(opponents, results, scores)
+
+    count = len(players)
+    identifiers = np.array(
+        [player.national_chess_id for player in players], dtype=object
+    )
+    # np.lexsort sorts by the last key first
+    order = np.lexsort(
+        [np.argsort(np.argsort(identifiers, kind="stable"))]
+        + [-tie_breaks[name][:count] for name in reversed(TIE_BREAKS)]
+        + [-scores[:count]]
+    )
+
+    values = {
+        player.national_chess_id: {
+            name: float(tie_breaks[name][row]) for name in TIE_BREAKS
+        }
+        for row, player in enumerate(players)
+    }
+    return [players[row] for row in order], values
@@ -1,15 +1,30 @@
 from .round import Round
 from .match import Match
-from .player import Player
+from .lazy_rounds import LazyRounds
+from .player_identity_map import PlayerIdentityMap
+from .pairing import (
+    DUTCH_TIME_BUDGET, PAIRING_SYSTEMS, PARALLEL_DEADLINE, ROUND_ROBIN,
+    berger_schedule
+)
+from .ratings import DEFAULT_RATING
+from .tie_breaks import compute_standings
 
 from datetime import datetime
 import random
-from tinydb import TinyDB, Query
 
-db = TinyDB("data/db.json")
+import numpy as np
 
 
 class Tournament:
+    __slots__ = (
+        "name", "location", "description", "identity_map", "players",
+        "number_of_rounds", "current_round_number", "rounds",
+        "start_date", "end_date", "doc_id", "pairing_system",
+        "pairing_time_budget", "pairing_deadline", "seeding",
+        "schedule", "bye_score", "_saved_data", "player_indices", "played",
+        "colour_balance", "player_match_count", "byes", "_history_built"
+    )
+
     def __init__(
             self,
             name,
@@ -21,7 +36,13 @@ class Tournament:
             rounds=None,
             start_date=None,
             end_date=None,
-            doc_id=None
+            doc_id=None,
+            pairing_system="weighted",
+            pairing_time_budget=DUTCH_TIME_BUDGET,
+            pairing_deadline=PARALLEL_DEADLINE,
+            seeding=None,
+            bye_score=1,
+            identity_map=None
     ):
         """
         Initialize a Tournament instance.
@@ -32,26 +53,120 @@ class Tournament:
         :param players: A list of players participating in the tournament.
         :param number_of_rounds: The total number of rounds in the tournament.
         :param current_round_number: The current round number.
-        :param rounds: A list of rounds in the tournament.
+        :param rounds: A list of rounds in the tournament, or a LazyRounds
+            sequence converting them on first access.
         :param start_date: The start date of the tournament.
         :param end_date: The end date of the tournament.
         :param doc_id: The document ID in the database.
+        :param pairing_system: The name of the pairing system, a key of
+            PAIRING_SYSTEMS or ROUND_ROBIN.
+        :param pairing_time_budget: The time budget in seconds of the Dutch
+            pairing search before it falls back to the weighted pairing.
+        :param pairing_deadline: The time in seconds the parallel pairing
+            search runs for.
+        :param seeding: The national chess IDs of the players in the order
+            of the round-robin schedule, by descending rating by default.
+        :param bye_score: The score given to a player left without an
+            opponent.
+        :param identity_map: The PlayerIdentityMap the players and rounds
+            were loaded with, a new one by default.
         """
         self.name = name
         self.location = location
         self.description = description
-        self.players = [
-            Player(**player) if isinstance(player, dict) else player
-            for player in players
-        ]
+        self.identity_map = (
+            identity_map if identity_map is not None else PlayerIdentityMap()
+        )
+        # one instance per national chess ID, in the given order
+        self.players = list({
+            player.national_chess_id: player
+            for player in map(self.identity_map.add, players)
+        }.values())
         self.number_of_rounds = number_of_rounds
         self.current_round_number = current_round_number
-        self.rounds = rounds if rounds else []
+        self.rounds = (
+            rounds if isinstance(rounds, LazyRounds) else LazyRounds(rounds)
+        )
         self.start_date = start_date
         self.end_date = end_date
         self.doc_id = doc_id
+        self.pairing_system = pairing_system
+        self.pairing_time_budget = pairing_time_budget
+        self.pairing_deadline = pairing_deadline
+        self.seeding = None
+        self.schedule = None
+        self.bye_score = bye_score
+        self._saved_data = None
+        self.player_indices = {}
+        self.played = np.zeros((0, 0), dtype=bool)
+        self.colour_balance = np.zeros(0, dtype=np.int64)
+        self.player_match_count = {}
+        self.byes = set()
+        # built from the rounds on first use, so loading a tournament does
+        # not convert its rounds
+        self._history_built = False
+        if self.is_round_robin():
+            self.schedule_round_robin(seeding)
+
+    @classmethod
+    def from_dict(cls, tournament_data, doc_id=None, lookup=None):
+        """
+        Create a tournament from a serialized tournament.
 
-    def serialize(self):
+        Players are created once per national chess ID in a new identity
+        map, with their current rating from the lookup, and the rounds are
+        only converted to Round instances when they are accessed.
+
+        :param tournament_data: The serialized tournament.
+        :param doc_id: The document ID in the database.
+        :param lookup: An optional callable returning the serialized player
+            of a national chess ID, used to resolve players that are not
+            part of the tournament anymore (e.g. PlayersIndex.get).
+        :return: The Tournament instance.
+        """
+        identity_map = PlayerIdentityMap(lookup)
+        players = [
+            identity_map.add(player_data)
+            for player_data in tournament_data["players"]
+        ]
+        if lookup:
+            for player in players:
+                registered = lookup(player.national_chess_id)
+                if registered:
+                    player.rating = registered.get("rating", DEFAULT_RATING)
+        start_date = tournament_data.get("start_date")
+        end_date = tournament_data.get("end_date")
+        return cls(
+            name=tournament_data["name"],
+            location=tournament_data["location"],
+            description=tournament_data["description"],
+            players=players,
+            number_of_rounds=tournament_data["number_of_rounds"],
+            current_round_number=tournament_data["current_round_number"],
+            rounds=LazyRounds(
+                rounds_data=tournament_data["rounds"],
+                materialize=lambda round_data: Round.from_dict(
+                    round_data, identity_map
+                )
+            ),
+            start_date=(
+                datetime.fromisoformat(start_date) if start_date else None
+            ),
+            end_date=datetime.fromisoformat(end_date) if end_date else None,
+            doc_id=doc_id,
+            pairing_system=tournament_data.get("pairing_system", "weighted"),
+            pairing_time_budget=tournament_data.get(
+                "pairing_time_budget", DUTCH_TIME_BUDGET
+            ),
+            pairing_deadline=tournament_data.get(
+                "pairing_deadline", PARALLEL_DEADLINE
+            ),
+            seeding=tournament_data.get("seeding"),
+            bye_score=tournament_data.get("bye_score", 1),
+            identity_map=identity_map
+        )
+
+    def to_dict(self):
         """
         Serialize the tournament data to a dictionary.
 
@@ -61,18 +176,10 @@ class Tournament:
             "name": self.name,
             "location": self.location,
             "description": self.description,
-            "players": [
-                {
-                    "name": player.name,
-                    "surname": player.surname,
-                    "birthday": player.birthday,
-                    "national_chess_id": player.national_chess_id,
-                    "score": player.score
-                } for player in self.players
-            ],
+            "players": [player.to_dict() for player in self.players],
             "number_of_rounds": self.number_of_rounds,
             "current_round_number": self.current_round_number,
-            "rounds": [round.serialize() for round in self.rounds],
+            "rounds": self.rounds.to_dict(),
             "start_date": (
                 self.start_date.isoformat()
                 if self.start_date
@@ -82,98 +189,310 @@ class Tournament:
                 self.end_date.isoformat()
                 if self.end_date
                 else None
-            )
+            ),
+            "pairing_system": self.pairing_system,
+            "pairing_time_budget": self.pairing_time_budget,
+            "pairing_deadline": self.pairing_deadline,
+            "seeding": self.seeding,
+            "bye_score": self.bye_score
         }
 
-    def create_round(self):
+    def create_round(self, precomputed=None):
         """
         Generate matches and create a new round for the tournament.
 
+        :param precomputed: An optional (ranked players, pairs, bye) tuple
+            computed in advance for the current standings, e.g. by a
+            PairingPrecomputer, used instead of pairing the players again.
         :return: The created Round instance.
         """
+        self.ensure_match_history()
         self.current_round_number += 1
         round = Round(f"Round {self.current_round_number}")
 
-        played_pairs, player_match_count = self.get_match_history()
-        self.sort_players_for_round(player_match_count)
-        matches = self.generate_matches(played_pairs, player_match_count)
+        if self.is_round_robin():
+            matches, bye = self.scheduled_matches(self.current_round_number)
+        elif precomputed is not None:
+            self.players, pairs, bye = precomputed
+            matches = [
+                Match(player_1, player_2) for player_1, player_2 in pairs
+            ]
+        else:
+            # players may have been added to the tournament since the last
+            # round
+            for player in self.players:
+                self.intern_player(player.national_chess_id)
+            self.sort_players_for_round(self.player_match_count)
+            matches, bye = self.generate_matches(self.played)
+        for match in matches:
+            self.record_match(match)
+        if bye is not None:
+            bye.score += self.bye_score
+            round.bye = bye
+            round.bye_score = self.bye_score
+            self.record_bye(bye)
 
         round.matches = matches
         self.rounds.append(round)
         return round
 
-    def get_match_history(self):
+    def accepts_new_players(self):
+        """
+        Check whether players can be added to the tournament: a round-robin
+        schedule is fixed once its first round is created.
+
+        :return: True if players can be added.
         """
-        Track all pairs that have already played and count matches per player.
+        return not (self.is_round_robin() and self.rounds)
 
-        :return: Tuple of (played_pairs, player_match_count)
+    def add_players(self, players):
         """
-        played_pairs = set()
-        player_match_count = {player.national_chess_id: 0 for player in self.players}
+        Add players to the tournament. A player who already played in the
+        tournament gets back the Player instance of their matches. Raise a
+        ValueError if the tournament does not accept new players.
 
+        :param players: A list of Player instances.
+        """
+        if not self.accepts_new_players():
+            raise ValueError(
+                "Players cannot be added to a round-robin tournament once "
+                "its first round is created."
+            )
+        for player in players:
+            self.players.append(self.identity_map.add(player))
+
+    def is_round_robin(self):
+        """
+        Check whether the rounds come from a round-robin schedule.
+
+        :return: True for a round-robin tournament.
+        """
+        return self.pairing_system == ROUND_ROBIN
+
+    def schedule_round_robin(self, seeding=None):
+        """
+        Compute every round of a round-robin tournament at once with the
+        Berger tables. The schedule is computed again before the first round
+        if players were added or removed in the meantime.
+
+        :param seeding: The national chess IDs of the players in schedule
+            order, the players by descending rating by default.
+        """
+        self.seeding = (
+            list(seeding) if seeding
+            else [
+                player.national_chess_id for player in sorted(
+                    self.players, key=lambda player: -player.rating
+                )
+            ]
+        )
+        self.schedule = berger_schedule(len(self.seeding))
+        self.number_of_rounds = len(self.schedule)
+
+    def scheduled_matches(self, round_number):
+        """
+        Build the matches of a round of the round-robin schedule.
+
+        :param round_number: The number of the round, starting at 1.
+        :return: Tuple of (list of Match instances, bye player or None)
+        """
+        player_ids = [player.national_chess_id for player in self.players]
+        if not self.rounds and set(player_ids) != set(self.seeding):
+            self.schedule_round_robin()
+        if round_number > len(self.schedule):
+            # no players, or more rounds than the schedule has
+            return [], None
+        players_by_id = dict(zip(player_ids, self.players))
+        matches = [
+            Match(
+                players_by_id[self.seeding[white]],
+                players_by_id[self.seeding[black]]
+            )
+            for white, black in self.schedule[round_number - 1]
+            if self.seeding[white] in players_by_id
+            and self.seeding[black] in players_by_id
+        ]
+
+        bye = None
+        if len(self.seeding) % 2:
+            scheduled = {
+                position for pair in self.schedule[round_number - 1]
+                for position in pair
+            }
+            bye_ids = [
+                national_chess_id
+                for position, national_chess_id in enumerate(self.seeding)
+                if position not in scheduled
+            ]
+            bye = players_by_id.get(bye_ids[0])
+        return matches, bye
+
+    def ensure_match_history(self):
+        """
+        Build the match history from the rounds if it was not built yet.
+        """
+        if not self._history_built:
+            self.rebuild_match_history()
+
+    def rebuild_match_history(self):
+        """
+        Intern the players to dense integer indices and rebuild the "already
+        played" matrix, the colour balances, the match counts and the byes
+        from the rounds, once before the first pairing of the tournament. New
+        matches and byes are then recorded one by one with record_match and
+        record_bye.
+        """
+        self._history_built = True
+        count = len(self.players)
+        self.player_indices = {}
+        self.played = np.zeros((count, count), dtype=bool)
+        self.colour_balance = np.zeros(count, dtype=np.int64)
+        self.player_match_count = {}
+        self.byes = set()
+        for player in self.players:
+            self.intern_player(player.national_chess_id)
         for previous_round in self.rounds:
             for match in previous_round.matches:
-                pair = frozenset([
-                    match.player_1.national_chess_id,
-                    match.player_2.national_chess_id
-                ])
-                played_pairs.add(pair)
-                player_match_count[match.player_1.national_chess_id] += 1
-                player_match_count[match.player_2.national_chess_id] += 1
+                self.record_match(match)
+            if previous_round.bye is not None:
+                self.record_bye(previous_round.bye)
 
-        return played_pairs, player_match_count
+    def intern_player(self, national_chess_id):
+        """
+        Return the dense integer index of a player, allocating it on first
+        use and growing the "already played" matrix and the colour balances
+        if needed.
 
-    def sort_players_for_round(self, player_match_count):
+        :param national_chess_id: The national chess ID of the player.
+        :return: The index of the player.
         """
-        Sort players by number of matches, score, and random factor.
+        self.ensure_match_history()
+        index = self.player_indices.get(national_chess_id)
+        if index is None:
+            index = len(self.player_indices)
+            self.player_indices[national_chess_id] = index
+            self.player_match_count[national_chess_id] = 0
+            if index >= len(self.played):
+                size = max(2 * len(self.played), 1)
+                played = np.zeros((size, size), dtype=bool)
+                played[:index, :index] = self.played
+                self.played = played
+                colour_balance = np.zeros(size, dtype=np.int64)
+                colour_balance[:index] = self.colour_balance
+                self.colour_balance = colour_balance
+        return index
+
+    def record_match(self, match):
         """
-        self.players.sort(
-            key=lambda p: (
-                player_match_count[p.national_chess_id],
-                -p.score,
-                random.random()
-            )
-        )
+        Mark the players of a match as having played each other and update
+        their match counts and colour balances, player_1 playing white.
 
-    def generate_matches(self, played_pairs, player_match_count):
+        :param match: The Match instance.
+        """
+        player_1_id = match.player_1.national_chess_id
+        player_2_id = match.player_2.national_chess_id
+        index_1 = self.intern_player(player_1_id)
+        index_2 = self.intern_player(player_2_id)
+        self.played[index_1, index_2] = self.played[index_2, index_1] = True
+        self.colour_balance[index_1] += 1
+        self.colour_balance[index_2] -= 1
+        self.player_match_count[player_1_id] += 1
+        self.player_match_count[player_2_id] += 1
+
+    def record_bye(self, player):
         """
-        Generate matches for the current round.
+        Record that a player was left without an opponent for a round. The
+        bye counts as a match, so the player is not paired first afterwards.
 
-        :param played_pairs: Set of pairs that have already played
-        :param player_match_count: Dict of match counts per player
-        :return: List of Match instances
+        :param player: The Player instance.
         """
-        matches = []
-        unpaired_players = self.players[:]
+        self.intern_player(player.national_chess_id)
+        self.byes.add(player.national_chess_id)
+        self.player_match_count[player.national_chess_id] += 1
 
-        while len(unpaired_players) > 1:
-            player_1 = unpaired_players.pop(0)
-            best_match = self.find_best_match(player_1, unpaired_players, played_pairs)
+    @staticmethod
+    def _round_sort_key(player_match_count):
+        """
+        Build the key ranking the players for a round: by number of matches,
+        score, rating, and random factor.
 
-            unpaired_players.remove(best_match)
-            match = Match(player_1, best_match)
-            matches.append(match)
+        :param player_match_count: Dict of match counts per player.
+        :return: A key function for sorted or list.sort.
+        """
+        def key(player):
+            return (
+                player_match_count[player.national_chess_id],
+                -player.score,
+                -player.rating,
+                random.random()
+            )
+        return key
 
-        return matches
+    def sort_players_for_round(self, player_match_count):
+        """
+        Sort players by number of matches, score, rating, and random factor.
+        """
+        self.players.sort(key=self._round_sort_key(player_match_count))
 
-    def find_best_match(self, player_1, unpaired_players, played_pairs):
+    def ranked_players_for_round(self, players=None):
         """
-        Find the best match for a player.
+        Return a copy of the players sorted like sort_players_for_round,
+        leaving the tournament untouched.
 
-        :param player_1: The player to find a match for
-        :param unpaired_players: List of players not yet matched
-        :param played_pairs: Set of pairs that have already played
-        :return: The best match for player_1
+        :param players: The players to sort, e.g. copies of the tournament
+            players with other scores, the tournament players by default.
+        :return: A list of players.
         """
-        for player_2 in unpaired_players:
-            current_pair = frozenset([
-                player_1.national_chess_id,
-                player_2.national_chess_id
-            ])
-            if current_pair not in played_pairs:
-                return player_2
+        self.ensure_match_history()
+        return sorted(
+            self.players if players is None else players,
+            key=self._round_sort_key(self.player_match_count)
+        )
 
-        return unpaired_players[0]
+    def generate_matches(self, played):
+        """
+        Generate matches for the current round with the pairing system of
+        the tournament.
+
+        :param played: Boolean "already played" matrix of interned indices
+        :return: Tuple of (list of Match instances, bye player or None)
+        """
+        pairs, bye = self.generate_pairs(self.players, played)
+        return [
+            Match(player_1, player_2) for player_1, player_2 in pairs
+        ], bye
+
+    def generate_pairs(self, players, played):
+        """
+        Pair players with the pairing system of the tournament, within its
+        time budget or deadline. With an odd number of players, the pairing
+        system chooses the bye together with the pairs, knowing who already
+        had one, and the player it leaves out gets the bye.
+
+        :param players: The players, ranked for the round.
+        :param played: Boolean "already played" matrix of interned indices
+        :return: Tuple of (list of (player_1, player_2) tuples in board
+            order, bye player or None)
+        """
+        self.ensure_match_history()
+        options = {
+            "dutch": {"time_budget": self.pairing_time_budget},
+            "parallel": {"deadline": self.pairing_deadline},
+        }.get(self.pairing_system, {})
+        pairs = PAIRING_SYSTEMS[self.pairing_system](
+            players, self.player_indices, played, self.colour_balance,
+            byes=self.byes, **options
+        )
+        bye = None
+        if len(players) % 2:
+            paired = {
+                player.national_chess_id for pair in pairs for player in pair
+            }
+            bye = next(
+                player for player in players
+                if player.national_chess_id not in paired
+            )
+        return pairs, bye
 
     def start_current_round(self):
         """
@@ -204,21 +523,42 @@ class Tournament:
         """
         self.end_date = datetime.now()
 
-    def save_tournament(self):
+    def save_tournament(self, database):
         """
-        Save or update the tournament in the database.
+        Save or update the tournament and its summary in the database.
+
+        The tournament is stored under its document ID, allocated on first
+        save, so renaming it never creates a duplicate document. Rounds reuse
+        their cached serialized form when they did not change, and nothing is
+        written if the tournament did not change since it was last saved.
+
+        :param database: The Database instance to save the tournament to.
         """
-        tournaments_table = db.table("tournaments")
-        tournaments_table.upsert(self.serialize(), Query().name == self.name)
+        tournament_data = self.to_dict()
+        if tournament_data == self._saved_data:
+            return
+
+        if self.doc_id is None:
+            self.doc_id = database.insert_tournament(tournament_data)
+        else:
+            database.update_tournament(self.doc_id, tournament_data)
+        self._saved_data = tournament_data
 
     def get_ranked_players(self):
         """
-        Get the players ranked by their score.
+        Get the players ranked by their score, then by their tie-breaks.
 
         :return: A list of players sorted by score.
         """
-        return sorted(
-            self.players, key=lambda player: (
-                -player.score, random.random()
-            )
-        )
+        return self.get_standings()[0]
+
+    def get_standings(self):
+        """
+        Get the players ranked by their score, then by their Buchholz,
+        median Buchholz, Sonneborn-Berger and progressive scores. The
+        standings are deterministic.
+
+        :return: Tuple of (list of ranked players, dict of the tie-breaks of
+            each player keyed by national chess ID)
+        """
+        return compute_standings(self.players, self.rounds)
@@ -0,0 +1,92 @@
+from tinydb.table import Document
+
+
+class TournamentSummaries:
+    def __init__(self, summaries_table):
+        """
+        Initialize a TournamentSummaries instance.
+
+        The "tournament_summaries" table of the catalog is a projection of
+        the tournament files holding only what is needed to list tournaments.
+        It is also the authority on which tournaments exist: each summary
+        shares the document ID of its tournament file.
+
+        :param summaries_table: The TinyDB "tournament_summaries" table.
+        """
+        self.summaries_table = summaries_table
+
+    def all(self):
+        """
+        Return all tournament summaries.
+
+        :return: A list of summary documents.
+        """
+        return self.summaries_table.all()
+
+    def __contains__(self, doc_id):
+        """
+        Check whether a tournament with the given document ID exists.
+
+        :param doc_id: The document ID of the tournament.
+        :return: True if the tournament exists, False otherwise.
+        """
+        return self.summaries_table.contains(doc_id=doc_id)
+
+    def doc_ids(self):
+        """
+        Return the document IDs of every tournament.
+
+        :return: A list of document IDs.
+        """
+        return [summary.doc_id for summary in self.summaries_table.all()]
+
+    def insert(self, summary):
+        """
+        Insert the summary of a new tournament, allocating its document ID.
+
+        :param summary: The summary of the tournament.
+        :return: The document ID of the new tournament.
+        """
+        return self.summaries_table.insert(summary)
+
+    def save(self, doc_id, summary):
+        """
+        Save or update the summary of a tournament.
+
+        :param doc_id: The document ID of the tournament.
+        :param summary: The summary of the tournament.
+        """
+        self.summaries_table.upsert(Document(summary, doc_id=doc_id))
+
+    def rebuild(self, tournaments):
+        """
+        Rebuild every summary from the tournament documents.
+
+        :param tournaments: An iterable of (doc_id, tournament document)
+            tuples.
+        """
+        summaries = [
+            Document(summarize(tournament_data), doc_id=doc_id)
+            for doc_id, tournament_data in tournaments
+        ]
+        self.summaries_table.truncate()
+        self.summaries_table.insert_multiple(summaries)
+
+
+def summarize(tournament_data):
+    """
+    Build the summary of a serialized tournament.
+
+    :param tournament_data: The serialized tournament.
+    :return: A dictionary summary of the tournament.
+    """
+    return {
+        "name": tournament_data["name"],
+        "location": tournament_data["location"],
+        "description": tournament_data["description"],
+        "current_round_number": tournament_data["current_round_number"],
+        "number_of_rounds": tournament_data["number_of_rounds"],
+        "players_count": len(tournament_data["players"]),
+        "start_date": tournament_data.get("start_date"),
+        "end_date": tournament_data.get("end_date")
+    }
@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from models.pairing import PAIRING_SYSTEMS, ROUND_ROBIN
+from models.player import Player
+from models.tournament import Tournament
+
+
+def build_players(count):
+    return [
+        Player(f"Name{index}", f"Surname{index}", "2000-01-01",
+               f"AB{index:05d}")
+        for index in range(count)
+    ]
+
+
+class ByeTest(unittest.TestCase):
+    def test_bye_is_chosen_with_the_pairs(self):
+        # the last player already had a bye and the first player already
+        # played every other player but the fourth: giving the bye to the
+        # fourth would force a rematch, the only pairing without rematch or
+        # second bye gives it to the first player
+        players = build_players(5)
+        player_indices = {
+            player.national_chess_id: index
+            for index, player in enumerate(players)
+        }
+        played = np.zeros((5, 5), dtype=bool)
+        for opponent in (1, 2, 4):
+            played[0, opponent] = played[opponent, 0] = True
+        for name in ("weighted", "dutch"):
+            with self.subTest(pairing_system=name):
+                pairs = PAIRING_SYSTEMS[name](
+                    players, player_indices, played,
+                    byes={players[4].national_chess_id}
+                )
+                paired = {player for pair in pairs for player in pair}
+                self.assertEqual(
+                    [player for player in players if player not in paired],
+                    [players[0]]
+                )
+                self.assertFalse(any(
+                    played[player_indices[player_1.national_chess_id],
+                           player_indices[player_2.national_chess_id]]
+                    for player_1, player_2 in pairs
+                ))
+
+    def test_odd_field_gets_one_bye_per_round(self):
+        tournament = Tournament(
+            "Open", "Paris", "Test", build_players(21), 20
+        )
+        byes = []
+        for _ in range(20):
+            round_instance = tournament.create_round()
+            byes.append(round_instance.bye.national_chess_id)
+            for match in round_instance.matches:
+                match.set_result("0")
+        self.assertEqual(len(set(byes)), 20)
+
+
+class RoundRobinTest(unittest.TestCase):
+    def test_players_cannot_join_after_the_first_round(self):
+        players = build_players(5)
+        tournament = Tournament(
+            "Closed", "Paris", "Test", players[:4],
+            pairing_system=ROUND_ROBIN
+        )
+        tournament.add_players(players[4:])
+        tournament.create_round()
+        self.assertFalse(tournament.accepts_new_players())
+        with self.assertRaises(ValueError):
+            tournament.add_players(build_players(6)[5:])
+        self.assertEqual(len(tournament.players), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
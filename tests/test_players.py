@@ -0,0 +1,41 @@
+import tempfile
+import unittest
+from unittest import mock
+
+from controllers.main_controller import Controller
+from models.database import Database
+
+
+class AddPlayersTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = Database(self.directory.name)
+        self.controller = Controller(self.database)
+        self.controller.view = mock.Mock()
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def add_player(self, name):
+        self.controller.view.prompt_for_add_player.return_value = (
+            name, "Surname", "2000-01-01", "AB00001"
+        )
+        self.controller.view.prompt_for_add_another_player.return_value = (
+            False
+        )
+        self.controller.db_add_players()
+
+    def test_re_entered_player_keeps_the_stored_rating(self):
+        self.add_player("Name")
+        self.database.players_index.update_ratings({"AB00001": 1519.98})
+        self.add_player("Renamed")
+
+        player_data = self.database.players_index.get("AB00001")
+        self.assertEqual(player_data["name"], "Renamed")
+        self.assertEqual(player_data["rating"], 1519.98)
+        self.assertEqual(len(self.database.players_index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import tempfile
+import unittest
+
+from models.database import Database
+from models.player import Player
+from models.ratings import recompute_ratings, update_round_ratings
+from models.tournament import Tournament
+
+
+def build_players(count):
+    return [
+        Player(f"Name{index}", f"Surname{index}", "2000-01-01",
+               f"AB{index:05d}")
+        for index in range(count)
+    ]
+
+
+class RecomputeTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = Database(self.directory.name)
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def play_round(self, tournament, rng):
+        round_instance = tournament.create_round()
+        round_instance.start_round()
+        for match in round_instance.matches:
+            match.set_result(rng.choice("012"))
+        round_instance.end_round()
+        rated_players = update_round_ratings(round_instance)
+        self.database.players_index.update_ratings({
+            player.national_chess_id: player.rating
+            for player in rated_players
+        })
+        tournament.save_tournament(self.database)
+
+    def assert_recompute_changes_nothing(self):
+        live_ratings = {
+            player_data["national_chess_id"]: player_data["rating"]
+            for player_data in self.database.players_index.all()
+        }
+        recompute_ratings(self.database)
+        for player_data in self.database.players_index.all():
+            self.assertAlmostEqual(
+                player_data["rating"],
+                live_ratings[player_data["national_chess_id"]]
+            )
+        self.assertNotEqual(len(set(live_ratings.values())), 1)
+
+    def test_recompute_after_live_rating_changes_nothing(self):
+        rng = random.Random(0)
+        players = build_players(16)
+        self.database.players_index.insert_multiple(
+            [player.serialize() for player in players]
+        )
+        # two tournaments played at the same time, sharing some players
+        tournaments = [
+            Tournament("Open A", "Paris", "Test", players[:10], 5),
+            Tournament("Open B", "Lyon", "Test", players[6:], 5)
+        ]
+        for _ in range(4):
+            for tournament in tournaments:
+                self.play_round(tournament, rng)
+        self.assert_recompute_changes_nothing()
+
+        # the recompute cached the games, saving a round must refresh them
+        self.play_round(tournaments[0], rng)
+        self.assert_recompute_changes_nothing()
+
+
+if __name__ == "__main__":
+    unittest.main()
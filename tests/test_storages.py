@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from models.database import Database
+from models.storages import AtomicArrayStorage
+
+
+def player_data(national_chess_id):
+    return {
+        "name": "Name",
+        "surname": "Surname",
+        "birthday": "2000-01-01",
+        "national_chess_id": national_chess_id,
+        "rating": 1500.0
+    }
+
+
+class UnitOfWorkTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = Database(self.directory.name)
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def reopen(self):
+        self.database.close()
+        self.database = Database(self.directory.name)
+
+    def test_outer_failure_writes_nothing(self):
+        with self.assertRaises(ValueError):
+            with self.database.unit_of_work():
+                self.database.players_index.insert(player_data("AB00001"))
+                self.database.tournament_store.write(1, {"name": "T"})
+                raise ValueError
+        self.reopen()
+        self.assertNotIn("AB00001", self.database.players_index)
+        self.assertIsNone(self.database.tournament_store.read(1))
+
+    def test_nested_failure_only_discards_the_inner_unit(self):
+        with self.database.unit_of_work():
+            self.database.players_index.insert(player_data("AB00001"))
+            self.database.tournament_store.write(1, {"name": "T1"})
+            try:
+                with self.database.unit_of_work():
+                    self.database.players_index.insert(
+                        player_data("AB00002")
+                    )
+                    self.database.tournament_store.write(2, {"name": "T2"})
+                    raise ValueError
+            except ValueError:
+                pass
+            self.database.players_index.insert(player_data("AB00003"))
+            self.database.tournament_store.write(3, {"name": "T3"})
+            # nothing reaches the files before the outer unit commits
+            self.assertIsNone(
+                Database(self.directory.name).tournament_store.read(3)
+            )
+        self.reopen()
+        self.assertIn("AB00001", self.database.players_index)
+        self.assertNotIn("AB00002", self.database.players_index)
+        self.assertIn("AB00003", self.database.players_index)
+        self.assertEqual(
+            [
+                self.database.tournament_store.read(doc_id)
+                for doc_id in (1, 2, 3)
+            ],
+            [{"name": "T1"}, None, {"name": "T3"}]
+        )
+
+
+class AtomicArrayStorageTest(unittest.TestCase):
+    def test_round_trip(self):
+        arrays = (
+            np.array(["AB00001", "AB00002"]),
+            np.array(["2024-05-01T18:00:00"], dtype="datetime64[us]"),
+            np.arange(10.0).reshape(2, 5),
+            np.empty((0, 5))
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            storage = AtomicArrayStorage(os.path.join(directory, "1.bin"))
+            self.assertIsNone(storage.read())
+            storage.write(arrays)
+            content = storage.read()
+        self.assertEqual(len(content), len(arrays))
+        for array, read_array in zip(arrays, content):
+            self.assertEqual(read_array.dtype, array.dtype)
+            np.testing.assert_array_equal(read_array, array)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+import warnings
+
+from models.player import Player
+from models.tie_breaks import compute_standings
+from models.tournament import Tournament
+
+
+class TieBreaksTest(unittest.TestCase):
+    def test_player_without_games_does_not_warn(self):
+        players = [
+            Player(f"Name{index}", f"Surname{index}", "2000-01-01",
+                   f"AB{index:05d}")
+            for index in range(5)
+        ]
+        tournament = Tournament("Open", "Paris", "Test", players, 3)
+        round_instance = tournament.create_round()
+        for match in round_instance.matches:
+            match.set_result("1")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            ranked, tie_breaks = compute_standings(
+                tournament.players, tournament.rounds
+            )
+
+        # the bye player has no opponent, their tie-breaks are zero
+        bye_values = tie_breaks[round_instance.bye.national_chess_id]
+        self.assertEqual(bye_values["buchholz"], 0.0)
+        self.assertEqual(bye_values["median_buchholz"], 0.0)
+        self.assertEqual(len(ranked), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,3 +17,27 @@ def format_date(date_obj):
         return "Not available"
 
     return date_obj.strftime("%Y/%m/%d %H:%M:%S")
+
+
+TIE_BREAK_HEADERS = {
+    "buchholz": "Buchholz",
+    "median_buchholz": "Median Buchholz",
+    "sonneborn_berger": "Sonneborn-Berger",
+    "progressive": "Progressive",
+}
+
+
+def format_tie_breaks(tie_breaks, player):
+    """
+    Format the tie-breaks of a player for a ranking table.
+
+    :param tie_breaks: The tie-breaks of each player, keyed by national
+        chess ID, or None.
+    :param player: The player instance.
+    :return: A list of formatted values, in the order of TIE_BREAK_HEADERS.
+    """
+    values = (tie_breaks or {}).get(player.national_chess_id, {})
+    return [
+        f"{values[name]:g}" if name in values else "-"
+        for name in TIE_BREAK_HEADERS
+    ]
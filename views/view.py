@@ -1,4 +1,4 @@
-from .utils import format_date
+from .utils import TIE_BREAK_HEADERS, format_date, format_tie_breaks
 
 from prettytable import PrettyTable
 
@@ -45,6 +45,8 @@ class View:
             "1": "display all players",
             "2": "add a player",
             "3": "edit a player",
+            "4": "import players from a file",
+            "5": "recompute ratings",
             "0": "return to main menu"
         }
         return self.display_menu("Players Menu", options)
@@ -76,6 +78,8 @@ class View:
             "3": "display tournament details (name and dates)",
             "4": "display players of a tournament (alphabetically)",
             "5": "display all rounds and matches of a tournament",
+            "6": "export all players to a CSV or NDJSON file",
+            "7": "export all tournament matches to a CSV or NDJSON file",
             "0": "return to main menu"
         }
         return self.display_menu("Reports Menu", options)
@@ -128,7 +132,8 @@ class View:
         table = PrettyTable()
         table.title = "<<<Tournament Informations>>>"
         table.field_names = [
-            "Name", "Location", "Description", "Current Round", "Players"
+            "Name", "Location", "Description", "Current Round", "Players",
+            "Pairing"
         ]
 
         table.add_row([
@@ -136,7 +141,8 @@ class View:
             tournament.location,
             tournament.description,
             f"{tournament.current_round_number}/{tournament.number_of_rounds}",
-            len(tournament.players)
+            len(tournament.players),
+            tournament.pairing_system
         ])
 
         print(f"\n{table}")
@@ -163,13 +169,13 @@ class View:
 
         print(f"\n{table}")
 
-    def show_all_tournaments(self, tournaments):
+    def show_all_tournaments(self, summaries):
         """
         Display all tournaments.
 
-        :param tournaments: A list of tournament instances to display.
+        :param summaries: A list of tournament summary documents to display.
         """
-        if not tournaments:
+        if not summaries:
             print("\nNo tournaments available.")
             return
 
@@ -180,24 +186,24 @@ class View:
             "Players", "Start Date", "End Date"
         ]
 
-        for tournament, doc_id in tournaments:
+        for summary in summaries:
             table.add_row([
-                doc_id,
-                tournament.name,
-                tournament.location,
-                tournament.description,
+                summary.doc_id,
+                summary["name"],
+                summary["location"],
+                summary["description"],
 
-                f"{tournament.current_round_number}/"
-                f"{tournament.number_of_rounds}",
+                f"{summary['current_round_number']}/"
+                f"{summary['number_of_rounds']}",
 
-                len(tournament.players),
+                summary["players_count"],
 
-                format_date(tournament.start_date)
-                if tournament.start_date
+                format_date(summary["start_date"])
+                if summary["start_date"]
                 else "Not started yet",
 
-                format_date(tournament.end_date)
-                if tournament.end_date
+                format_date(summary["end_date"])
+                if summary["end_date"]
                 else "Not finished yet"
             ])
 
@@ -244,10 +250,65 @@ class View:
             return True
         return False
 
-    def prompt_for_tournament(self):
+    def prompt_for_import_file(self):
+        """
+        Prompt the user for the licensee file to import.
+
+        :return: The path of the file.
+        """
+        print("\n<<<Import players>>>")
+        return input(
+            "Enter the path of the CSV, NDJSON or JSON licensee file: "
+        ).strip()
+
+    def show_import_progress(self, rows_read):
+        """
+        Display the number of rows read so far during an import.
+
+        :param rows_read: The number of rows read.
+        """
+        print(f"\r{rows_read} rows read...", end="", flush=True)
+
+    def show_import_report(self, report):
+        """
+        Display the report of a players import.
+
+        :param report: The report dictionary of the import.
+        """
+        table = PrettyTable()
+        table.title = "<<<Import Report>>>"
+        table.field_names = [
+            "Rows read", "Imported", "Duplicates", "Invalid", "Seconds",
+            "Rows/s"
+        ]
+
+        table.add_row([
+            report["read"],
+            report["imported"],
+            report["duplicates"],
+            report["invalid"],
+            f"{report['seconds']:.2f}",
+            f"{report['rows_per_second']:.0f}"
+        ])
+
+        print(f"\n{table}")
+
+    def prompt_for_export_file(self):
+        """
+        Prompt the user for the file to export to.
+
+        :return: The path of the file.
+        """
+        print("\n<<<Export>>>")
+        return input(
+            "Enter the path of the .csv, .ndjson or .jsonl file to write: "
+        ).strip()
+
+    def prompt_for_tournament(self, pairing_systems):
         """
         Prompt the user to create a new tournament.
 
+        :param pairing_systems: The names of the available pairing systems.
         :return: A tuple containing the tournament's information.
         """
         print("\n<<<Tournament creation>>>")
@@ -255,8 +316,19 @@ class View:
         location = input("Enter the tournament's location: ")
         description = input("Enter the tournament's description: ")
         number_of_rounds = input("Enter the number of rounds: ")
+        pairing_system = input(
+            f"Enter the pairing system ({', '.join(pairing_systems)}), "
+            "weighted by default: "
+        )
+        bye_score = input(
+            "Enter the score of a player left without opponent, "
+            "1 by default: "
+        )
 
-        return name, location, description, number_of_rounds
+        return (
+            name, location, description, number_of_rounds, pairing_system,
+            bye_score
+        )
 
     def show_player(self, player):
         """
@@ -267,14 +339,15 @@ class View:
         table = PrettyTable()
         table.title = "<<<Player Information>>>"
         table.field_names = [
-            "Name", "Surname", "Birthday", "National Chess ID"
+            "Name", "Surname", "Birthday", "National Chess ID", "Rating"
         ]
 
         table.add_row([
             player.name,
             player.surname,
             player.birthday,
-            player.national_chess_id
+            player.national_chess_id,
+            round(player.rating)
         ])
 
         print(f"\n{table}")
@@ -292,7 +365,8 @@ class View:
         table = PrettyTable()
         table.title = "<<<Tournament's Players>>>"
         table.field_names = [
-            "National Chess ID", "Name", "Surname", "Birthday", "Score"
+            "National Chess ID", "Name", "Surname", "Birthday", "Rating",
+            "Score"
         ]
 
         for player in players:
@@ -301,22 +375,28 @@ class View:
                 player.name,
                 player.surname,
                 player.birthday,
+                round(player.rating),
                 player.score
             ])
 
         print(f"\n{table}")
 
-    def show_tournament_results(self, tournament_instance, ranked_players):
+    def show_tournament_results(
+            self, tournament_instance, ranked_players, tie_breaks=None
+    ):
         """
         Display the final ranking of a tournament.
 
         :param tournament_instance: The tournament instance.
         :param ranked_players: A list of ranked player instances.
+        :param tie_breaks: The tie-breaks of each player, keyed by national
+            chess ID.
         """
         table = PrettyTable()
         table.title = (f"<<<{tournament_instance.name} - Final Ranking>>>")
         table.field_names = [
-            "Rank", "National Chess ID", "Name", "Surname", "Score"
+            "Rank", "National Chess ID", "Name", "Surname", "Score",
+            *TIE_BREAK_HEADERS.values()
         ]
 
         for rank, player in enumerate(ranked_players, start=1):
@@ -325,7 +405,8 @@ class View:
                 player.national_chess_id,
                 player.name,
                 player.surname,
-                player.score
+                player.score,
+                *format_tie_breaks(tie_breaks, player)
             ])
 
         print(f"\n{table}")
@@ -338,16 +419,19 @@ class View:
             )}"
         )
 
-    def show_ranked_players(self, ranked_players):
+    def show_ranked_players(self, ranked_players, tie_breaks=None):
         """
         Display the ranking of players in a tournament.
 
         :param ranked_players: A list of ranked player instances.
+        :param tie_breaks: The tie-breaks of each player, keyed by national
+            chess ID.
         """
         table = PrettyTable()
         table.title = "<<<Tournament Ranking>>>"
         table.field_names = [
-            "Rank", "National Chess ID", "Name", "Surname", "Score"
+            "Rank", "National Chess ID", "Name", "Surname", "Score",
+            *TIE_BREAK_HEADERS.values()
         ]
 
         for rank, player in enumerate(ranked_players, start=1):
@@ -356,7 +440,8 @@ class View:
                 player.national_chess_id,
                 player.name,
                 player.surname,
-                player.score
+                player.score,
+                *format_tie_breaks(tie_breaks, player)
             ])
 
         print(f"\n{table}")
@@ -374,7 +459,7 @@ class View:
         table = PrettyTable()
         table.title = "<<<Registered Players>>>"
         table.field_names = [
-            "National Chess ID", "Name", "Surname", "Birthday"
+            "National Chess ID", "Name", "Surname", "Birthday", "Rating"
         ]
 
         for player in players:
@@ -382,7 +467,8 @@ class View:
                 player.national_chess_id,
                 player.name,
                 player.surname,
-                player.birthday
+                player.birthday,
+                round(player.rating)
             ])
 
         print(f"\n{table}")
@@ -441,6 +527,12 @@ class View:
                 f"{match.player_1_match_score}|{match.player_2_match_score}",
                 f"{match.player_2.name} {match.player_2.surname}"
             ])
+        if round_instance.bye:
+            table.add_row([
+                f"{round_instance.bye.name} {round_instance.bye.surname}",
+                f"{round_instance.bye_score}",
+                "Bye"
+            ])
         print(f"\n{table}")
 
     def show_match(self, match_instance):
@@ -492,6 +584,16 @@ class View:
                     f"{match.player_2.name} {match.player_2.surname} "
                     f"({match.player_2.national_chess_id})"
                 ])
+            if round_instance.bye:
+                matches_table.add_row([
+                    f"({round_instance.bye.national_chess_id}) "
+                    f"{round_instance.bye.name} "
+                    f"{round_instance.bye.surname}",
+
+                    f"{round_instance.bye_score}",
+
+                    "Bye"
+                ])
 
             matches_str = matches_table.get_string()
 
@@ -526,6 +628,12 @@ class View:
                 f"{match.player_1_match_score}|{match.player_2_match_score}",
                 f"{match.player_2.name} {match.player_2.surname}"
             ])
+        if round_instance.bye:
+            table.add_row([
+                f"{round_instance.bye.name} {round_instance.bye.surname}",
+                f"{round_instance.bye_score}",
+                "Bye"
+            ])
         print(f"\n{table}")
         print(
             f"    Start date: {format_date(str(round_instance.start_date))}\n"